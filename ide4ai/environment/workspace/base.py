@@ -3,26 +3,26 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
+import hashlib
 import json
 import os.path
 import select
 import signal
 import subprocess
 import threading
-import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Collection, Sequence
 from io import BufferedReader
 from json import JSONDecodeError
 from pathlib import Path
-from typing import Any, ClassVar, Literal, cast
+from typing import IO, Any, ClassVar, Literal, cast
+from urllib.parse import unquote
 
 import gymnasium as gym
-from cachetools import TTLCache
+from cachetools import LRUCache, TTLCache
 from gymnasium.core import RenderFrame
 from loguru import logger
-from pydantic import AnyUrl
 from typing_extensions import SupportsFloat
 
 from ide4ai.dtos.base_protocol import LSPResponseMessage
@@ -30,6 +30,7 @@ from ide4ai.dtos.diagnostics import DocumentDiagnosticReport, PreviousResultId,
 from ide4ai.dtos.workspace_edit import LSPWorkspaceEdit
 from ide4ai.environment.workspace.model import TextModel
 from ide4ai.environment.workspace.schema import Position, Range, SearchResult, SingleEditOperation, TextEdit
+from ide4ai.environment.workspace.utils import to_any_url
 from ide4ai.schema import ACTION_CATEGORY_MAP, IDEAction, IDEObs
 from ide4ai.utils import is_subdirectory, list_directory_tree, render_symbols
 
@@ -97,6 +98,13 @@ class BaseWorkspace(gym.Env, ABC):
         self.lsp_server_notifications: TTLCache = TTLCache(maxsize=1000, ttl=300)
         # 对于发起的request，我们需要等待response，因此需要缓存response，key值是request_id
         self.lsp_server_response: TTLCache = TTLCache(maxsize=1000, ttl=300)
+        # 每当监控线程写入一条 response/notification 时通知等待方，避免轮询
+        # Notified whenever the monitor thread stores a response/notification, so waiters do not need to poll
+        self._lsp_message_arrived = threading.Condition()
+        # documentSymbol 结果缓存，key 为 (URI, 内容摘要)。内容变化即自然失效，重新打开或撤销回相同内容时可直接复用
+        # documentSymbol result cache keyed by (URI, content digest). Changed content misses naturally, while reopening a
+        # file or undoing back to the same content reuses the cached result
+        self._document_symbols_cache: LRUCache = LRUCache(maxsize=256)
         # 初始化动作空间与观察空间
         self.action_space = gym.spaces.Dict(
             {
@@ -176,20 +184,32 @@ class BaseWorkspace(gym.Env, ABC):
         }
         if message_id is not None:
             msg["id"] = message_id
-        # 转换为JSON字符串
-        msg_str = json.dumps(msg)
-        # 计算 content_length
-        content_length = len(msg_str.encode("utf-8"))
+        # 转换为JSON字符串并只编码一次，长度与发送内容共用同一份 bytes
+        body = json.dumps(msg).encode("utf-8")
         # 发送请求
         with self.lsp_stdin_mutex:
-            full_message = f"Content-Length: {content_length}\r\n\r\n{msg_str}"
             if self.lsp.stdin:
-                self.lsp.stdin.write(
-                    full_message.encode("utf-8"),
-                )  # LSP进程以bytes模式打开，因为LSP协议也是按照bytes进行传输的与长度计算
-                self.lsp.stdin.flush()
+                # LSP进程以bytes模式打开，因为LSP协议也是按照bytes进行传输的与长度计算
+                self._write_lsp_frame(self.lsp.stdin, body)
         return self.read_response(message_id) if message_id else None
 
+    @staticmethod
+    def _write_lsp_frame(stdin: IO[bytes], body: bytes) -> None:
+        """
+        向 LSP stdin 写入一帧消息，调用方需持有 lsp_stdin_mutex
+
+        Write one LSP frame to stdin. The caller must hold lsp_stdin_mutex. The header and the already-encoded body are
+        handed to the buffered stdin separately, so the body is neither re-encoded nor copied into a concatenated
+        string; small frames still leave in a single write on flush.
+
+        Args:
+            stdin (IO[bytes]): LSP 进程的 stdin | stdin of the LSP process
+            body (bytes): UTF-8 编码后的 JSON-RPC 消息体 | UTF-8 encoded JSON-RPC message body
+        """
+        stdin.write(b"Content-Length: %d\r\n\r\n" % len(body))
+        stdin.write(body)
+        stdin.flush()
+
     def _start_lsp_monitor_thread(self) -> None:
         """
         Start the thread to monitor the output of the Language Server Protocol (LSP) server.
@@ -327,6 +347,8 @@ class BaseWorkspace(gym.Env, ABC):
                     uri = str(params.get("uri")) if isinstance(params, dict) else "NotExists"
                     key = self.__construct_notification_key(response_data["method"], uri)
                     self.lsp_server_notifications[key] = message_body
+            with self._lsp_message_arrived:
+                self._lsp_message_arrived.notify_all()
         except JSONDecodeError as e:
             logger.error(f"JSON解析失败 / Failed to decode JSON: {e}, message: {message_body}")
 
@@ -357,12 +379,7 @@ class BaseWorkspace(gym.Env, ABC):
         Returns:
             Optional[str]: The response of the LSP server.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if request_id in self.lsp_server_response:
-                return cast(str, self.lsp_server_response.pop(request_id))
-            time.sleep(0.1)
-        return None
+        return self._wait_for_lsp_message(self.lsp_server_response, request_id, timeout)
 
     def read_notification(self, method: str, uri: str, timeout: float = 0.05) -> str | None:
         """
@@ -376,12 +393,27 @@ class BaseWorkspace(gym.Env, ABC):
         Returns:
             Optional[str]: The notification of the LSP server.
         """
-        start_time = time.time()
         notification_key = self.__construct_notification_key(method, uri)
-        while time.time() - start_time < timeout:
-            if notification_key in self.lsp_server_notifications:
-                return cast(str, self.lsp_server_notifications.pop(notification_key))
-            time.sleep(0.1)
+        return self._wait_for_lsp_message(self.lsp_server_notifications, notification_key, timeout)
+
+    def _wait_for_lsp_message(self, cache: TTLCache, key: Any, timeout: float) -> str | None:
+        """
+        等待监控线程将指定 key 的消息写入缓存，并将其取出。消息到达时立即返回，而不是按固定间隔轮询
+
+        Wait until the monitor thread stores a message under the given key, then pop it. Returns as soon as the message
+        arrives instead of polling at a fixed interval.
+
+        Args:
+            cache (TTLCache): 消息缓存 / The message cache
+            key (Any): 消息的 key / The message key
+            timeout (float): 超时时间（秒）/ Timeout in seconds
+
+        Returns:
+            Optional[str]: 消息内容，超时返回 None / The message, or None on timeout
+        """
+        with self._lsp_message_arrived:
+            if self._lsp_message_arrived.wait_for(lambda: key in cache, timeout=timeout):
+                return cast(str, cache.pop(key))
         return None
 
     def pull_diagnostics(
@@ -463,52 +495,45 @@ class BaseWorkspace(gym.Env, ABC):
             "params": params,
             "id": msg_id,
         }
-        msg_str = json.dumps(msg)
-        content_length = len(msg_str.encode("utf-8"))
+        body = json.dumps(msg).encode("utf-8")
 
         with self.lsp_stdin_mutex:
-            full_message = f"Content-Length: {content_length}\r\n\r\n{msg_str}"
             logger.info("准备发送拉取诊断信息的请求...")
             if self.lsp.stdin:
-                self.lsp.stdin.write(full_message.encode("utf-8"))
-                self.lsp.stdin.flush()
+                self._write_lsp_frame(self.lsp.stdin, body)
 
         # 使用 timeout 等待响应 / Wait for response with timeout
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            logger.info("尝试获取诊断结果...")
-            if msg_id in self.lsp_server_response:
-                res = cast(str, self.lsp_server_response.pop(msg_id))
-                try:
-                    res_json = LSPResponseMessage.model_validate(json.loads(res))
-                    if res_json.error:
-                        logger.error(f"拉取诊断信息失败 / Failed to pull diagnostics: {res_json.error}")
-                        return None
+        res = self._wait_for_lsp_message(self.lsp_server_response, msg_id, timeout)
+        if res is not None:
+            try:
+                res_json = LSPResponseMessage.model_validate(json.loads(res))
+                if res_json.error:
+                    logger.error(f"拉取诊断信息失败 / Failed to pull diagnostics: {res_json.error}")
+                    return None
 
-                    # 根据模式解析不同的响应类型 / Parse different response types based on mode
-                    if uri is not None:
-                        # 文档诊断响应 / Document diagnostics response
-                        if isinstance(res_json.result, dict):
-                            kind = res_json.result.get("kind")
-                            if kind == "full":
-                                return RelatedFullDocumentDiagnosticReport.model_validate(res_json.result)
-                            elif kind == "unchanged":
-                                return RelatedUnchangedDocumentDiagnosticReport.model_validate(res_json.result)
-                        else:
-                            logger.error(f"获取到非法诊断数据: {res_json.result}")
-                            return None
+                # 根据模式解析不同的响应类型 / Parse different response types based on mode
+                if uri is not None:
+                    # 文档诊断响应 / Document diagnostics response
+                    if isinstance(res_json.result, dict):
+                        kind = res_json.result.get("kind")
+                        if kind == "full":
+                            return RelatedFullDocumentDiagnosticReport.model_validate(res_json.result)
+                        elif kind == "unchanged":
+                            return RelatedUnchangedDocumentDiagnosticReport.model_validate(res_json.result)
                     else:
-                        # 工作区诊断响应 / Workspace diagnostics response
-                        if isinstance(res_json.result, dict):
-                            return WorkspaceDiagnosticReport.model_validate(res_json.result)
-                        else:
-                            logger.error(f"获取到非法诊断数据: {res_json.result}")
-                            return None
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"解析诊断响应失败 / Failed to parse diagnostic response: {e}")
-                    return None
-            time.sleep(1)
+                        logger.error(f"获取到非法诊断数据: {res_json.result}")
+                        return None
+                else:
+                    # 工作区诊断响应 / Workspace diagnostics response
+                    if isinstance(res_json.result, dict):
+                        return WorkspaceDiagnosticReport.model_validate(res_json.result)
+                    else:
+                        logger.error(f"获取到非法诊断数据: {res_json.result}")
+                        return None
+
+            except json.JSONDecodeError as e:
+                logger.error(f"解析诊断响应失败 / Failed to parse diagnostic response: {e}")
+                return None
 
         # 超时未收到响应 / Timeout without receiving response
         target = uri if uri else "workspace"
@@ -535,7 +560,7 @@ class BaseWorkspace(gym.Env, ABC):
         Returns:
             Optional[TextModel]: The model instance.
         """
-        return next(filter(lambda m: m.uri == AnyUrl(uri), self.models), None)
+        return next(filter(lambda m: m.uri == to_any_url(uri), self.models), None)
 
     @property
     def active_models(self) -> list[TextModel]:
@@ -813,7 +838,7 @@ class BaseWorkspace(gym.Env, ABC):
             None
         """
         self._assert_not_closed()
-        tm = next(filter(lambda m: m.uri == AnyUrl(uri), self.models), None)
+        tm = next(filter(lambda m: m.uri == to_any_url(uri), self.models), None)
         if tm:
             # will_save reason
             # 1: Manually triggered, e.g. by the user pressing save, by starting debugging, or by an API call.
@@ -940,7 +965,7 @@ class BaseWorkspace(gym.Env, ABC):
         Returns:
             None
         """
-        tm = next(filter(lambda m: m.uri == AnyUrl(uri), self.models), None)
+        tm = next(filter(lambda m: m.uri == to_any_url(uri), self.models), None)
         if tm:
             tm.dispose()
             self.deactivate_model(tm.m_id)
@@ -970,7 +995,7 @@ class BaseWorkspace(gym.Env, ABC):
         Returns:
             str: The content of the file.
         """
-        tm: TextModel | None = next(filter(lambda m: m.uri == AnyUrl(uri), self.models), None)
+        tm: TextModel | None = next(filter(lambda m: m.uri == to_any_url(uri), self.models), None)
         if tm:
             return (
                 tm.get_view(with_line_num, code_range)
@@ -985,6 +1010,28 @@ class BaseWorkspace(gym.Env, ABC):
                 else tm.get_simple_view(code_range)
             )
 
+    def read_file_bytes(self, *, uri: str) -> bytes:
+        """
+        读取磁盘上文件的原始字节，不做解码，也不打开文本模型。适用于只需要字节级判断的场景。注意结果不包含尚未保存的编辑
+
+        Read the raw bytes of a file on disk, without decoding it or opening a text model. Useful when only a byte-level
+        check is needed. Note that unsaved edits in an opened model are not reflected.
+
+        Args:
+            uri (str): 文件的 URI / The URI of the file to be read.
+
+        Returns:
+            bytes: 文件的原始字节 / The raw bytes of the file.
+
+        Raises:
+            ValueError: URI 的路径为空时 / If the path of the URI is empty.
+        """
+        self._assert_not_closed()
+        path = to_any_url(uri).path
+        if not path:
+            raise ValueError("The path of the URI is empty.")
+        return Path(unquote(path)).read_bytes()
+
     def expand_folder(self, *, uri: str) -> str:
         """
         Expand a folder in the workspace.
@@ -1104,26 +1151,52 @@ class BaseWorkspace(gym.Env, ABC):
             raise ValueError(f"Folder path {folder_path} is not expanded")
         return list_directory_tree(folder_path, include_dirs=self.expand_folders, recursive=True)
 
-    def get_file_symbols(self, *, uri: str, kinds: list[int]) -> str:
+    def request_document_symbols(self, uri: str) -> LSPResponseMessage | None:
         """
-        Get the symbols in a file in the workspace.
+        向 LSP 请求文件的 documentSymbol。对于已打开的文件，成功的结果按 (URI, 内容摘要) 缓存，相同内容的重复请求
+        （包括关闭后重新打开同一文件）不会再访问 LSP 服务器
+
+        Request documentSymbol for a file from the LSP server. For opened files, successful results are cached by
+        (URI, content digest), so repeated requests for the same content, including after closing and reopening the
+        file, do not hit the LSP server again.
 
         Args:
-            uri (str): The URI of the file to get the symbols from.
-            kinds (list[int]): The kinds of symbols to get.
+            uri (str): 文件的 URI / The URI of the file
 
         Returns:
-            str: The symbols in the file.
+            LSPResponseMessage | None: LSP 响应，超时返回 None / The LSP response, or None on timeout
         """
-        self._assert_not_closed()
+        tm = self.get_model(uri)
+        cache_key = (uri, hashlib.sha256(tm.get_value().encode("utf-8")).digest()) if tm else None
+        if cache_key and (cached := self._document_symbols_cache.get(cache_key)):
+            return cast(LSPResponseMessage, cached)
         mid = self.get_lsp_msg_id()
         lsp_res = self.send_lsp_msg(
             "textDocument/documentSymbol",
             {"textDocument": {"uri": uri}},
             message_id=mid,
         )
-        if lsp_res:
-            res_model = LSPResponseMessage.model_validate(json.loads(lsp_res))
+        if not lsp_res:
+            return None
+        res_model = LSPResponseMessage.model_validate(json.loads(lsp_res))
+        if cache_key and not res_model.error:
+            self._document_symbols_cache[cache_key] = res_model
+        return res_model
+
+    def get_file_symbols(self, *, uri: str, kinds: Collection[int]) -> str:
+        """
+        Get the symbols in a file in the workspace.
+
+        Args:
+            uri (str): The URI of the file to get the symbols from.
+            kinds (Collection[int]): The kinds of symbols to get.
+
+        Returns:
+            str: The symbols in the file.
+        """
+        self._assert_not_closed()
+        res_model = self.request_document_symbols(uri)
+        if res_model:
             if res_model.error:
                 return res_model.error.message
             symbols = res_model.result
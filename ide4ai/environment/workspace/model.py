@@ -41,12 +41,11 @@ from ide4ai.environment.workspace.utils import (
     contains_rtl,
     contains_unusual_line_terminators,
     count_eol,
-    detect_newline_type,
     first_non_whitespace_index,
     is_pure_basic_ascii,
     last_non_whitespace_index,
+    load_file_content,
     normalize_indentation,
-    read_file_with_bom_handling,
 )
 from ide4ai.schema import LanguageId
 
@@ -154,8 +153,7 @@ class TextModel(ModelProtocol):
             path = uri.path
             if not path:
                 raise ValueError("The path of the URI is empty.")
-            self.__eol = detect_newline_type(Path(path))
-            self.__bom, self._content = read_file_with_bom_handling(path)
+            self.__eol, self.__bom, self._content = load_file_content(path)
         self._is_basic_ascii = is_pure_basic_ascii(self._content)
         if not self._is_basic_ascii:
             self._might_contain_RTL = any(contains_rtl(text) for text in self._content)
@@ -4,15 +4,35 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 
+import functools
 import os
 import re
 import unicodedata
 from pathlib import Path
 from re import Pattern
 
+from pydantic import AnyUrl
+
 from ide4ai.environment.workspace.schema import EndOfLineSequence
 
 
+@functools.lru_cache(maxsize=1024)
+def to_any_url(uri: str) -> AnyUrl:
+    """
+    将 URI 字符串解析为 AnyUrl。Pydantic 的 URL 解析开销较大，而工作区按 URI 查找模型时会反复解析相同的字符串，因此缓存解析结果
+
+    Parse a URI string into an AnyUrl. Pydantic URL parsing is comparatively expensive and workspace model lookups parse
+    the same strings over and over, so the parsed results are cached.
+
+    Args:
+        uri (str): URI 字符串 / The URI string
+
+    Returns:
+        AnyUrl: 解析后的 URL / The parsed URL
+    """
+    return AnyUrl(uri)
+
+
 def detect_newline_type(uri: Path) -> EndOfLineSequence:
     """
     Detects the newline character in a file, accounting for cases where the first newline
@@ -32,13 +52,15 @@ def detect_newline_type(uri: Path) -> EndOfLineSequence:
                 content = file.read(1024)
                 if not content:  # 文件结束
                     break
-                if b"\r\n" in content:
-                    return EndOfLineSequence.CRLF
-                elif b"\n" in content:
-                    return EndOfLineSequence.LF
+                if (eol := _detect_newline_from_bytes(content)) is not None:
+                    return eol
     except OSError as e:
         raise ValueError(f"Error reading file {uri}: {e}") from e
 
+    return _default_newline_type()
+
+
+def _default_newline_type() -> EndOfLineSequence:
     # Determine the default newline based on the operating system
     if os.name == "nt":  # Windows
         return EndOfLineSequence.CRLF
@@ -58,37 +80,91 @@ UTF_8_BOM = "\ufeff"
 
 
 def read_file_with_bom_handling(path: str) -> tuple[str, list[str]]:
-    # 检查文件大小
-    file_size = os.path.getsize(path)
-    if file_size > LARGE_FILE_SIZE_THRESHOLD:
-        raise ValueError("File size exceeds the maximum limit of 100KB.")
+    # 与 load_file_content 共用读取与校验逻辑，只返回 BOM 与行内容 | Shares reading and checks with load_file_content
+    _, bom, content = load_file_content(path)
+    return bom, content
 
-    try:
-        with open(path, encoding="utf-8", newline="") as f:
-            content: list[str] = f.read().splitlines()
-            if not content:
-                content = [""]  # pragma: no cover
-
-        # 检查行数
-        if len(content) > LARGE_FILE_LINE_COUNT_THRESHOLD:
-            raise ValueError("File has more lines than the maximum allowed 300 lines.")
-
-        # 检查字符总数，以评估内存使用
-        total_characters = sum(len(line) for line in content)
-        if total_characters > LARGE_FILE_HEAP_OPERATION_THRESHOLD:
-            raise ValueError("File content exceeds the memory usage threshold of 256K characters.")
-
-        if len(content) > 0 and content[0].startswith(UTF_8_BOM):
-            bom = UTF_8_BOM
-            content[0] = content[0].lstrip(UTF_8_BOM)
-        else:
-            bom = ""
 
-        return bom, content
+def _split_file_content(text: str) -> tuple[str, list[str]]:
+    """
+    将文件文本切分为行，并校验行数与字符总数，剥离 UTF-8 BOM
+
+    Split file text into lines, validate line count and total characters, and strip the UTF-8 BOM.
+
+    Args:
+        text (str): 文件的完整文本 / The full text of the file
+
+    Returns:
+        tuple[str, list[str]]: (BOM, 行列表) / (BOM, content lines)
+    """
+    content: list[str] = text.splitlines()
+    if not content:
+        content = [""]  # pragma: no cover
+
+    # 检查行数
+    if len(content) > LARGE_FILE_LINE_COUNT_THRESHOLD:
+        raise ValueError("File has more lines than the maximum allowed 300 lines.")
+
+    # 检查字符总数，以评估内存使用
+    total_characters = sum(len(line) for line in content)
+    if total_characters > LARGE_FILE_HEAP_OPERATION_THRESHOLD:
+        raise ValueError("File content exceeds the memory usage threshold of 256K characters.")
+
+    if len(content) > 0 and content[0].startswith(UTF_8_BOM):
+        bom = UTF_8_BOM
+        content[0] = content[0].lstrip(UTF_8_BOM)
+    else:
+        bom = ""
+
+    return bom, content
+
+
+def load_file_content(path: str) -> tuple[EndOfLineSequence, str, list[str]]:
+    """
+    读取文件并解析出换行符类型、BOM 与行内容。文件只读取一次，换行符检测与行切分共用同一份字节
+
+    Read a file and parse its newline type, BOM and lines. The file is read once, and newline detection and line
+    splitting share the same bytes.
+
+    Args:
+        path (str): 文件路径 / Path to the file
+
+    Returns:
+        tuple[EndOfLineSequence, str, list[str]]: (换行符类型, BOM, 行内容) / (newline type, BOM, lines)
+
+    Raises:
+        ValueError: 文件无法读取、过大或不是 UTF-8 编码时 / If the file cannot be read, is too large or is not UTF-8
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(LARGE_FILE_SIZE_THRESHOLD + 1)
     except OSError as e:
-        raise ValueError(f"Error reading file {path}: {e}") from e  # pragma: no cover
+        raise ValueError(f"Error reading file {path}: {e}") from e
+    if len(raw) > LARGE_FILE_SIZE_THRESHOLD:
+        raise ValueError("File size exceeds the maximum limit of 100KB.")
+
+    try:
+        bom, content = _split_file_content(raw.decode("utf-8"))
     except UnicodeDecodeError as e:
         raise ValueError("Only UTF-8 encoded files are supported now.") from e
+    for start in range(0, len(raw), 1024):
+        if (eol := _detect_newline_from_bytes(raw[start : start + 1024])) is not None:
+            return eol, bom, content
+    return _default_newline_type(), bom, content
+
+
+def _detect_newline_from_bytes(chunk: bytes) -> EndOfLineSequence | None:
+    """
+    判断一块字节中的换行符：包含 \\r\\n 则为 CRLF，否则包含 \\n 则为 LF，没有换行符时返回 None
+
+    Detect the newline in one chunk of bytes: CRLF if it contains \\r\\n, otherwise LF if it contains \\n, and None
+    when the chunk has no newline.
+    """
+    if b"\r\n" in chunk:
+        return EndOfLineSequence.CRLF
+    elif b"\n" in chunk:
+        return EndOfLineSequence.LF
+    return None
 
 
 def is_high_surrogate(char: str) -> bool:
@@ -5,7 +5,9 @@
 # @Software: PyCharm
 
 
-DEFAULT_SYMBOL_VALUE_SET = [5, 6, 7, 8, 10]
+# 默认渲染的 SymbolKind：Class, Method, Property, Field, Enum。使用 frozenset 以便 O(1) 过滤
+# Default SymbolKinds to render: Class, Method, Property, Field, Enum. A frozenset gives O(1) filtering
+DEFAULT_SYMBOL_VALUE_SET: frozenset[int] = frozenset({5, 6, 7, 8, 10})
 
 
 DEFAULT_CAPABILITY = {
@@ -29,7 +31,7 @@ DEFAULT_CAPABILITY = {
         "codeAction": {
             "dataSupport": True,
         },
-        "documentSymbol": {"symbolKind": {"valueSet": DEFAULT_SYMBOL_VALUE_SET}},
+        "documentSymbol": {"symbolKind": {"valueSet": sorted(DEFAULT_SYMBOL_VALUE_SET)}},
     },
     "workspace": {
         "applyEdit": True,
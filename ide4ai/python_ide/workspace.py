@@ -4,13 +4,14 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 import datetime
+import functools
 import json
 import os
 import subprocess
 from collections.abc import Callable, Sequence
 from typing import Any, SupportsFloat, cast
 
-from pydantic import AnyUrl, ValidationError
+from pydantic import ValidationError
 
 from ide4ai.dtos.base_protocol import LSPResponseMessage
 from ide4ai.dtos.diagnostics import DocumentDiagnosticReport
@@ -18,6 +19,7 @@ from ide4ai.dtos.workspace_edit import LSPWorkspaceEdit
 from ide4ai.environment.workspace.base import BaseWorkspace
 from ide4ai.environment.workspace.model import TextModel
 from ide4ai.environment.workspace.schema import Position, Range, SearchResult, SingleEditOperation, TextEdit
+from ide4ai.environment.workspace.utils import to_any_url
 from ide4ai.exceptions import IDEExecutionError
 from ide4ai.python_ide.const import DEFAULT_CAPABILITY, DEFAULT_SYMBOL_VALUE_SET
 from ide4ai.schema import LSP_ACTIONS, TEXT_DOCUMENT_ACTIONS, WORKSPACE_ACTIONS, IDEAction, IDEObs, LanguageId
@@ -46,6 +48,28 @@ def default_python_header_generator(workspace: BaseWorkspace, file_path: str) ->
     )
 
 
+@functools.lru_cache(maxsize=32)
+def _render_shortcut_commands(commands: tuple[tuple[str, tuple[str, ...]], ...]) -> str:
+    """
+    渲染项目快捷命令片段。参数为冻结后的命令字典，相同的命令只格式化一次
+
+    Render the project shortcut commands section. Takes the commands dict frozen into tuples, so the same commands are
+    only formatted once.
+
+    Args:
+        commands (tuple[tuple[str, tuple[str, ...]], ...]): (命令前缀, 命令列表) 元组 | (prefix, commands) pairs
+
+    Returns:
+        str: 渲染后的快捷命令片段 | Rendered shortcut commands section
+    """
+    view = "\n项目快捷命令 | Project Shortcut Commands:\n"
+    for cmd_prefix, cmd_list in commands:
+        view += f"  {cmd_prefix} 命令:\n"
+        for cmd in cmd_list:
+            view += f"    - {cmd_prefix} {cmd}\n"
+    return view + "\n"
+
+
 class PyWorkspace(BaseWorkspace):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -497,25 +521,15 @@ class PyWorkspace(BaseWorkspace):
         view = f"当前工作区: {self.project_name}\n\n项目目录结构:\n{dir_info}\n"
 
         # 2. 添加项目快捷命令信息 | Add project shortcut commands info
-        if self.shortcut_commands:
-            view += "\n项目快捷命令 | Project Shortcut Commands:\n"
-            for cmd_prefix, cmd_list in self.shortcut_commands.items():
-                view += f"  {cmd_prefix} 命令:\n"
-                for cmd in cmd_list:
-                    view += f"    - {cmd_prefix} {cmd}\n"
-            view += "\n"
-        else:
+        shortcut_commands = self.shortcut_commands
+        if not shortcut_commands:
             # 如果没有shortcut_commands，尝试实时检测Makefile | Try to detect Makefile in real-time if no shortcut_commands
             from ide4ai.utils import detect_makefile_commands
 
-            detected_commands = detect_makefile_commands(self.root_dir)
-            if detected_commands:
-                view += "\n项目快捷命令 | Project Shortcut Commands:\n"
-                for cmd_prefix, cmd_list in detected_commands.items():
-                    view += f"  {cmd_prefix} 命令:\n"
-                    for cmd in cmd_list:
-                        view += f"    - {cmd_prefix} {cmd}\n"
-                view += "\n"
+            shortcut_commands = detect_makefile_commands(self.root_dir)
+        if shortcut_commands:
+            frozen_commands = tuple((prefix, tuple(cmds)) for prefix, cmds in shortcut_commands.items())
+            view += _render_shortcut_commands(frozen_commands)
 
         # 3. 渲染active_models信息 | Render active_models info
         active_models_count = len(self.active_models)
@@ -524,14 +538,8 @@ class PyWorkspace(BaseWorkspace):
             for active_view in self.active_models[:-1]:
                 uri = active_view.uri
                 view += f"文件URI: {uri}\n"
-                mid = self.get_lsp_msg_id()
-                lsp_res = self.send_lsp_msg(
-                    "textDocument/documentSymbol",
-                    {"textDocument": {"uri": str(uri)}},
-                    message_id=mid,
-                )
-                if lsp_res:
-                    res_model = LSPResponseMessage.model_validate(json.loads(lsp_res))
+                res_model = self.request_document_symbols(str(uri))
+                if res_model:
                     if res_model.error:
                         view += f"获取Symbols信息失败: {res_model.error}\n"  # pragma: no cover
                         continue  # pragma: no cover
@@ -556,10 +564,10 @@ class PyWorkspace(BaseWorkspace):
             TextModel: The model instance representing the opened file.
         """
         self._assert_not_closed()
-        if tm := next(filter(lambda model: model.uri == AnyUrl(uri), self.models), None):
+        if tm := next(filter(lambda model: model.uri == to_any_url(uri), self.models), None):
             self.active_model(tm.m_id)  # pragma: no cover
             return tm  # pragma: no cover
-        text_model = TextModel(language_id=LanguageId.python, uri=AnyUrl(uri))
+        text_model = TextModel(language_id=LanguageId.python, uri=to_any_url(uri))
         self.models.append(text_model)
         self.active_model(text_model.m_id)
         self.send_lsp_msg(
@@ -575,6 +583,32 @@ class PyWorkspace(BaseWorkspace):
         )
         return text_model
 
+    def open_files(self, *, uris: Sequence[str], active: str | None = None) -> list[TextModel]:
+        """
+        批量打开多个文件。didOpen 为 LSP 通知，不等待响应，因此多个文件的打开请求会被连续发送给 LSP 服务器。
+
+        Open several files at once. didOpen is an LSP notification that does not wait for a response, so the open
+        requests for all files are pipelined to the LSP server.
+
+        Args:
+            uris (Sequence[str]): 需要打开的文件 URI 列表，按顺序激活 / URIs of the files to open, activated in order
+            active (str | None): 打开完成后需要激活的文件 URI，必须在 uris 中。默认为 uris 的最后一个 /
+                URI of the file to activate afterwards, must be one of uris. Defaults to the last one in uris
+
+        Returns:
+            list[TextModel]: 与 uris 顺序一致的模型列表 / The models, in the same order as uris
+
+        Raises:
+            ValueError: 如果 active 不在 uris 中 / If active is not one of uris
+        """
+        target = to_any_url(active) if active is not None else None
+        if target is not None and target not in [to_any_url(uri) for uri in uris]:
+            raise ValueError(f"active 必须是 uris 中的一个 / active must be one of uris: {active}")
+        models = [self.open_file(uri=uri) for uri in uris]
+        if target is not None:
+            self.active_model(next(model for model in models if model.uri == target).m_id)
+        return models
+
     def apply_edit(
         self,
         *,
@@ -601,7 +635,7 @@ class PyWorkspace(BaseWorkspace):
                 - Diagnostics result after editing / 编辑后的诊断结果
         """
         self._assert_not_closed()
-        text_model = next(filter(lambda model: model.uri == AnyUrl(uri), self.models), None)
+        text_model = next(filter(lambda model: model.uri == to_any_url(uri), self.models), None)
         if not text_model:
             text_model = self.open_file(uri=uri)  # pragma: no cover
         try:
@@ -749,7 +783,7 @@ class PyWorkspace(BaseWorkspace):
                         header = header_generator(self, file_path)
                         file.write(header)
                         break
-            tm = TextModel(language_id=LanguageId.python, uri=AnyUrl(uri))
+            tm = TextModel(language_id=LanguageId.python, uri=to_any_url(uri))
 
             # 在文件创建后追加初始化内容（如果存在）/ Append initial content after file creation (if exists)
             if init_content:
@@ -867,7 +901,7 @@ class PyWorkspace(BaseWorkspace):
         if file_path.is_file():
             text_model = self.get_model(uri)
             if not text_model:
-                text_model = TextModel(language_id=LanguageId.python, uri=AnyUrl(uri))
+                text_model = TextModel(language_id=LanguageId.python, uri=to_any_url(uri))
             return text_model.find_matches(
                 query,
                 search_scope,
@@ -908,7 +942,7 @@ class PyWorkspace(BaseWorkspace):
                                 # 创建临时文本模型 / Create temporary text model
                                 text_model = TextModel(
                                     language_id=LanguageId.python,
-                                    uri=AnyUrl(file_uri),
+                                    uri=to_any_url(file_uri),
                                     auto_save_during_dispose=False,  # 临时模型不需要自动保存 / Temporary model doesn't need auto-save
                                 )
                             except Exception as e:
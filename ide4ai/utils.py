@@ -4,6 +4,8 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 import os
+import re
+from collections.abc import Collection
 from typing import Literal
 
 from loguru import logger
@@ -11,14 +13,44 @@ from loguru import logger
 from ide4ai.dtos.text_documents import LSPRange
 from ide4ai.environment.workspace.schema import Range
 
-
-def render_symbols(symbols: list[dict], render_symbol_kind: list[int], indent: int = 0) -> str:
+# 符号种类的字典映射
+_SYMBOL_KIND_NAMES = {
+    1: "File",
+    2: "Module",
+    3: "Namespace",
+    4: "Package",
+    5: "Class",
+    6: "Method",
+    7: "Property",
+    8: "Field",
+    9: "Constructor",
+    10: "Enum",
+    11: "Interface",
+    12: "Function",
+    13: "Variable",
+    14: "Constant",
+    15: "String",
+    16: "Number",
+    17: "Boolean",
+    18: "Array",
+    19: "Object",
+    20: "Key",
+    21: "Null",
+    22: "EnumMember",
+    23: "Struct",
+    24: "Event",
+    25: "Operator",
+    26: "TypeParameter",
+}
+
+
+def render_symbols(symbols: list[dict], render_symbol_kind: Collection[int], indent: int = 0) -> str:
     """
     递归渲染LSP符号列表为人类可读的文本格式，并返回形成的字符串。
 
     Args:
         symbols: 符号列表，每个符号是一个包含name, kind, 可选children的字典。
-        render_symbol_kind: 需要渲染的符号种类列表。
+        render_symbol_kind: 需要渲染的符号种类集合，建议传入 frozenset 以便快速过滤。
         indent: 当前缩进级别，用于格式化输出。
 
     返回:
@@ -26,42 +58,13 @@ def render_symbols(symbols: list[dict], render_symbol_kind: list[int], indent: i
     """
     # 用于缩进的空格
     indent_space = " " * 2 * indent
-    # 符号种类的字典映射
-    symbol_kinds = {
-        1: "File",
-        2: "Module",
-        3: "Namespace",
-        4: "Package",
-        5: "Class",
-        6: "Method",
-        7: "Property",
-        8: "Field",
-        9: "Constructor",
-        10: "Enum",
-        11: "Interface",
-        12: "Function",
-        13: "Variable",
-        14: "Constant",
-        15: "String",
-        16: "Number",
-        17: "Boolean",
-        18: "Array",
-        19: "Object",
-        20: "Key",
-        21: "Null",
-        22: "EnumMember",
-        23: "Struct",
-        24: "Event",
-        25: "Operator",
-        26: "TypeParameter",
-    }
 
     lines = []  # 用于收集所有的输出行
     for symbol in symbols:
         if symbol["kind"] not in render_symbol_kind:
             continue
         # 获取符号的种类名称，如果找不到则默认为'Unknown Symbol'
-        kind_name = symbol_kinds.get(symbol["kind"], "Unknown Symbol")
+        kind_name = _SYMBOL_KIND_NAMES.get(symbol["kind"], "Unknown Symbol")
 
         # 构造当前符号的描述
         line = f"{indent_space}{kind_name}: {symbol['name']}"
@@ -228,6 +231,10 @@ def get_minimal_expanded_tree(root_dir: str, target_file_path: str, indent: str
     return "\n".join(output)
 
 
+# Makefile目标格式: target: dependencies，匹配行首的目标定义 | Makefile target format: target: dependencies, at line start
+_MAKE_TARGET_RE = re.compile(r"^([a-zA-Z0-9_-]+):")
+
+
 def detect_makefile_commands(root_dir: str) -> dict[str, list[str]] | None:
     """
     检测项目根目录下的Makefile并提取可用命令 | Detect Makefile and extract available commands
@@ -245,56 +252,56 @@ def detect_makefile_commands(root_dir: str) -> dict[str, list[str]] | None:
             Command dict, key is command prefix (e.g., "make"), value is command list
             如果没有Makefile则返回None | Returns None if no Makefile found
     """
-    import re
-    from pathlib import Path
-
-    root_path = Path(root_dir)
     all_targets = set()  # 使用set去重 | Use set to deduplicate
 
-    # 1. 检测标准Makefile名称 | Detect standard Makefile names
-    # GNU Make按此优先级查找：GNUmakefile > makefile > Makefile
-    # GNU Make searches in this priority: GNUmakefile > makefile > Makefile
-    standard_names = ["GNUmakefile", "makefile", "Makefile"]
-
-    # 2. 使用glob查找所有可能的makefile | Use glob to find all possible makefiles
-    makefile_patterns = [
-        "*.mk",  # 模块化makefile片段 | Modular makefile fragments
-        "Makefile.*",  # 平台特定makefile | Platform-specific makefiles
-    ]
+    # 1. 标准Makefile名称，GNU Make按此优先级查找：GNUmakefile > makefile > Makefile
+    # Standard Makefile names, GNU Make searches in this priority: GNUmakefile > makefile > Makefile
+    standard_names = ("GNUmakefile", "makefile", "Makefile")
+    standard_paths: dict[str, str] = {}
+    # 2. *.mk 模块化makefile片段与 Makefile.* 平台特定makefile | *.mk fragments and platform-specific Makefile.*
+    makefile_paths: list[str] = []
 
-    makefile_paths = []
+    # 单次 scandir 遍历根目录，is_file() 复用目录项自带的文件类型，无需逐个 stat |
+    # Scan the root directory once; is_file() reuses the file type reported with each entry instead of a stat per path
+    try:
+        with os.scandir(root_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name in standard_names:
+                    if entry.is_file():
+                        standard_paths[name] = entry.path
+                elif (name.endswith(".mk") or name.startswith("Makefile.")) and entry.is_file():
+                    makefile_paths.append(entry.path)
+    except OSError:
+        return None
 
-    # 添加标准名称的makefile | Add standard named makefiles
+    # 只取优先级最高的标准makefile | Only keep the standard makefile with the highest priority
     for name in standard_names:
-        path = root_path / name
-        if path.is_file():
-            makefile_paths.append(path)
-            break  # 找到第一个标准makefile就停止 | Stop at first standard makefile
-
-    # 添加通过glob找到的makefile | Add makefiles found via glob
-    for pattern in makefile_patterns:
-        makefile_paths.extend(root_path.glob(pattern))
+        if name in standard_paths:
+            makefile_paths.insert(0, standard_paths[name])
+            break
 
     if not makefile_paths:
         return None
 
-    # 提取所有目标（targets）| Extract all targets
-    # Makefile目标格式: target: dependencies | Makefile target format: target: dependencies
-    # 匹配行首的目标定义，排除以.开头的特殊目标 |
-    # Match target definitions at line start, exclude special targets starting with .
-    pattern = r"^([a-zA-Z0-9_-]+):"
-
+    # 提取所有目标（targets），排除以.开头的特殊目标 | Extract all targets, excluding special targets starting with .
     for makefile_path in makefile_paths:
         try:
             with open(makefile_path, encoding="utf-8") as f:
                 content = f.read()
 
-            for line in content.split("\n"):
-                line = line.strip()
-                # 跳过注释和空行 | Skip comments and empty lines
-                if line.startswith("#") or not line:
+            for raw_line in content.split("\n"):
+                # 跳过以tab开头的配方行 | Skip recipe lines, which start with a tab
+                if raw_line.startswith("\t"):
+                    continue
+                line = raw_line.strip()
+                # 在正则匹配前用廉价的检查跳过注释、空行、.PHONY 等特殊目标、不含冒号的行以及变量赋值（VAR = a:b, VAR := x）|
+                # Cheap checks before the regex: skip comments, empty lines, special targets such as .PHONY, lines
+                # without a colon and variable assignments (VAR = a:b, VAR := x)
+                colon = line.find(":")
+                if colon <= 0 or line[0] in "#." or "=" in line[:colon] or line[colon + 1 : colon + 2] == "=":
                     continue
-                match = re.match(pattern, line)
+                match = _MAKE_TARGET_RE.match(line)
                 if match:
                     target = match.group(1)
                     # 排除常见的内部目标 | Exclude common internal targets
@@ -19,6 +19,12 @@ from ide4ai.a2c_smcp.tools import BashTool
 from ide4ai.environment.terminal.command_filter import CommandFilterConfig
 from ide4ai.ides import PyIDESingleton
 
+# virtual_project 的绝对路径，模块导入时计算一次
+# Absolute path to virtual_project, computed once at import time
+_VIRTUAL_PROJECT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../integration/python_ide/virtual_project"),
+)
+
 
 @pytest.fixture
 def ide_instance():
@@ -28,14 +34,8 @@ def ide_instance():
     Returns:
         PythonIDE: IDE 实例 | IDE instance
     """
-    # 获取 virtual_project 的绝对路径
-    # Get absolute path to virtual_project
-    test_dir = os.path.dirname(os.path.abspath(__file__))
-    root_dir = os.path.join(test_dir, "../../integration/python_ide/virtual_project")
-    root_dir = os.path.abspath(root_dir)
-
     ide_singleton = PyIDESingleton(
-        root_dir=root_dir,
+        root_dir=_VIRTUAL_PROJECT_DIR,
         project_name="test-project",
         cmd_filter=CommandFilterConfig.from_white_list(["ls", "pwd", "echo"]),
     )
@@ -23,10 +23,13 @@ from ide4ai.python_ide.ide import PythonIDE
 class TestReadTool:
     """测试 ReadTool 类 | Test ReadTool class"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def temp_ide(self):
         """
         创建临时 IDE 实例用于测试 | Create temporary IDE instance for testing
+
+        读取测试不修改文件，整个测试类共享同一个 IDE 实例
+        Read tests never modify files, so the whole test class shares one IDE instance
         """
         with tempfile.TemporaryDirectory() as tmpdir:
             # 创建测试文件 | Create test files
@@ -70,29 +73,33 @@ def function():
             # 清理 | Cleanup
             ide.close()
 
+    @pytest.fixture(scope="class")
+    def read_tool(self, temp_ide):
+        """
+        创建整个测试类共享的 ReadTool 实例 | Create a ReadTool instance shared by the whole test class
+        """
+        ide, _ = temp_ide
+        return ReadTool(ide)
+
     @pytest.mark.asyncio
-    async def test_tool_properties(self, temp_ide):
+    async def test_tool_properties(self, read_tool):
         """
         测试工具属性 | Test tool properties
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
-
-        assert tool.name == "Read"
-        assert "文件系统" in tool.description or "filesystem" in tool.description
-        assert isinstance(tool.input_schema, dict)
-        assert "file_path" in tool.input_schema["properties"]
+        assert read_tool.name == "Read"
+        assert "文件系统" in read_tool.description or "filesystem" in read_tool.description
+        assert isinstance(read_tool.input_schema, dict)
+        assert "file_path" in read_tool.input_schema["properties"]
 
     @pytest.mark.asyncio
-    async def test_read_simple_file(self, temp_ide):
+    async def test_read_simple_file(self, temp_ide, read_tool):
         """
         测试读取简单文件 | Test reading simple file
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "simple.py")
-        result = await tool.execute({"file_path": file_path})
+        result = await read_tool.execute({"file_path": file_path})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -104,15 +111,14 @@ def function():
         assert "|" in output.content  # 行号后面有分隔符 | Separator after line number
 
     @pytest.mark.asyncio
-    async def test_read_with_offset(self, temp_ide):
+    async def test_read_with_offset(self, temp_ide, read_tool):
         """
         测试使用偏移量读取 | Test reading with offset
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "multiline.py")
-        result = await tool.execute({"file_path": file_path, "offset": 5, "limit": 3})
+        result = await read_tool.execute({"file_path": file_path, "offset": 5, "limit": 3})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -125,15 +131,14 @@ def function():
         # 但实际返回可能取决于 Range 的实现 | But actual return may depend on Range implementation
 
     @pytest.mark.asyncio
-    async def test_read_with_offset_no_limit(self, temp_ide):
+    async def test_read_with_offset_no_limit(self, temp_ide, read_tool):
         """
         测试使用偏移量但不限制行数 | Test reading with offset but no limit
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "multiline.py")
-        result = await tool.execute({"file_path": file_path, "offset": 10})
+        result = await read_tool.execute({"file_path": file_path, "offset": 10})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -144,15 +149,14 @@ def function():
         assert "def function():" in output.content
 
     @pytest.mark.asyncio
-    async def test_read_nonexistent_file(self, temp_ide):
+    async def test_read_nonexistent_file(self, temp_ide, read_tool):
         """
         测试读取不存在的文件 | Test reading non-existent file
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "nonexistent.py")
-        result = await tool.execute({"file_path": file_path})
+        result = await read_tool.execute({"file_path": file_path})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -162,15 +166,14 @@ def function():
         assert "不存在" in output.error or "not found" in output.error.lower() or "no such file" in output.error.lower()
 
     @pytest.mark.asyncio
-    async def test_read_with_file_uri(self, temp_ide):
+    async def test_read_with_file_uri(self, temp_ide, read_tool):
         """
         测试使用 file:// URI 读取 | Test reading with file:// URI
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = f"file://{Path(tmpdir) / 'simple.py'}"
-        result = await tool.execute({"file_path": file_path})
+        result = await read_tool.execute({"file_path": file_path})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -179,15 +182,14 @@ def function():
         assert "Hello, World!" in output.content
 
     @pytest.mark.asyncio
-    async def test_read_long_file(self, temp_ide):
+    async def test_read_long_file(self, temp_ide, read_tool):
         """
         测试读取长文件 | Test reading long file
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "long_file.py")
-        result = await tool.execute({"file_path": file_path})
+        result = await read_tool.execute({"file_path": file_path})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -198,17 +200,16 @@ def function():
         assert "Line 100" in output.content
 
     @pytest.mark.asyncio
-    async def test_read_with_limit_only(self, temp_ide):
+    async def test_read_with_limit_only(self, temp_ide, read_tool):
         """
         测试只使用 limit 参数（应该从开头读取）| Test using only limit parameter (should read from beginning)
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "long_file.py")
         # 只提供 limit，不提供 offset，应该读取整个文件
         # Only provide limit without offset, should read entire file
-        result = await tool.execute({"file_path": file_path, "limit": 5})
+        result = await read_tool.execute({"file_path": file_path, "limit": 5})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
@@ -218,15 +219,12 @@ def function():
         assert "Line 1" in output.content
 
     @pytest.mark.asyncio
-    async def test_input_validation(self, temp_ide):
+    async def test_input_validation(self, read_tool):
         """
         测试输入验证 | Test input validation
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
-
         # 测试缺少必需参数 | Test missing required parameter
-        result = await tool.execute({})
+        result = await read_tool.execute({})
 
         output = ReadOutput.model_validate(result)
         assert output.success is False
@@ -234,15 +232,14 @@ def function():
         assert "验证失败" in output.error or "validation failed" in output.error.lower()
 
     @pytest.mark.asyncio
-    async def test_metadata_in_output(self, temp_ide):
+    async def test_metadata_in_output(self, temp_ide, read_tool):
         """
         测试输出中的元数据 | Test metadata in output
         """
-        ide, tmpdir = temp_ide
-        tool = ReadTool(ide)
+        _, tmpdir = temp_ide
 
         file_path = str(Path(tmpdir) / "simple.py")
-        result = await tool.execute({"file_path": file_path, "offset": 2, "limit": 2})
+        result = await read_tool.execute({"file_path": file_path, "offset": 2, "limit": 2})
 
         # 验证结果 | Verify result
         output = ReadOutput.model_validate(result)
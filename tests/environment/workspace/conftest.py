@@ -0,0 +1,44 @@
+# filename: conftest.py
+# @Time    : 2026/10/16
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+import os
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from tempfile import mkstemp
+from typing import Any
+
+import pytest
+from pydantic import AnyUrl
+
+from ide4ai.environment.workspace.model import TextModel
+from ide4ai.schema import LanguageId
+
+
+@contextmanager
+def _temp_text_model(content: str) -> Generator[TextModel, Any, None]:
+    """
+    用 mkstemp 创建临时 Python 文件并构建 TextModel，退出时确定性地删除文件
+
+    Create a temporary Python file with mkstemp and build a TextModel on it; the file is unlinked deterministically on
+    exit.
+    """
+    fd, path = mkstemp(suffix=".py")
+    try:
+        os.write(fd, content.encode("utf-8"))
+        os.close(fd)
+        yield TextModel(language_id=LanguageId.python, uri=AnyUrl(f"file://{path}"))
+    finally:
+        os.unlink(path)
+
+
+@pytest.fixture(scope="session")
+def temp_text_model() -> Callable[[str], AbstractContextManager[TextModel]]:
+    """
+    返回构建临时文件 TextModel 的上下文管理器工厂，供各测试模块的 fixture 使用
+
+    Return the context-manager factory that builds a TextModel on a temporary file, for the fixtures of the test
+    modules.
+    """
+    return _temp_text_model
@@ -3,8 +3,12 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
+import json
+import os
 import subprocess
 import tempfile
+import threading
+import time
 from collections.abc import Generator, Sequence
 from json import JSONDecodeError
 from typing import Any
@@ -14,13 +18,14 @@ import pytest
 
 from ide4ai.dtos.workspace_edit import LSPWorkspaceEdit
 from ide4ai.environment.workspace.base import BaseWorkspace
+from ide4ai.environment.workspace.model import TextModel
 from ide4ai.environment.workspace.schema import (
     Range,
     SearchResult,
     SingleEditOperation,
     TextEdit,
 )
-from ide4ai.schema import IDEAction
+from ide4ai.schema import IDEAction, LanguageId
 
 
 # Step 1: Define a concrete subclass for testing
@@ -150,6 +155,14 @@ def test_send_lsp_msg_json_error(workspace):
             workspace.send_lsp_msg("method", {"key": "value"})
 
 
+def test_send_lsp_msg_writes_frame(workspace):
+    workspace.send_lsp_msg("method", {"text": "你好"})
+    header, body = (c.args[0] for c in workspace.lsp.stdin.write.call_args_list[-2:])
+    assert header == b"Content-Length: %d\r\n\r\n" % len(body)
+    assert json.loads(body) == {"jsonrpc": "2.0", "method": "method", "params": {"text": "你好"}}
+    workspace.lsp.stdin.flush.assert_called()
+
+
 # Test timeout and response handling in read_response
 def test_read_response_timeout(workspace):
     response = workspace.read_response(999, timeout=0.1)  # Assuming 999 is not in lsp_server_response
@@ -162,6 +175,53 @@ def test_read_response_successful(workspace):
     assert 1 not in workspace.lsp_server_response
 
 
+def test_read_response_wakes_on_message(workspace):
+    body = '{"jsonrpc": "2.0", "id": 2, "result": null}'
+    workspace._lsp_buffer = f"Content-Length: {len(body)}\r\n\r\n{body}"
+    timer = threading.Timer(0.05, workspace._try_parse_one_message)
+    timer.start()
+    start = time.monotonic()
+    assert workspace.read_response(2, timeout=5) == body
+    assert time.monotonic() - start < 1
+    timer.join()
+
+
+def test_request_document_symbols_cached_per_content(workspace):
+    tm = TextModel(language_id=LanguageId.python)
+    workspace.models.append(tm)
+    response = '{"jsonrpc": "2.0", "id": 1, "result": []}'
+    with patch.object(workspace, "send_lsp_msg", return_value=response) as send:
+        assert workspace.request_document_symbols(str(tm.uri)).result == []
+        workspace.request_document_symbols(str(tm.uri))
+        assert send.call_count == 1
+        tm.set_value("class A:\n    pass")
+        workspace.request_document_symbols(str(tm.uri))
+        assert send.call_count == 2
+        # 恢复到已缓存过的内容时直接复用 / Restoring previously seen content reuses the cached result
+        tm.set_value("")
+        workspace.request_document_symbols(str(tm.uri))
+        assert send.call_count == 2
+
+
+def test_read_file_bytes(workspace):
+    file_path = os.path.join(workspace.root_dir, "raw.py")
+    with open(file_path, "wb") as f:
+        f.write(b"print('\xe4\xbd\xa0\xe5\xa5\xbd')\n")
+    assert workspace.read_file_bytes(uri=f"file://{file_path}") == b"print('\xe4\xbd\xa0\xe5\xa5\xbd')\n"
+    assert workspace.models == []
+
+
+def test_read_file_bytes_unquotes_path(workspace):
+    with open(os.path.join(workspace.root_dir, "raw file.py"), "wb") as f:
+        f.write(b"x = 1\n")
+    assert workspace.read_file_bytes(uri=f"file://{workspace.root_dir}/raw%20file.py") == b"x = 1\n"
+
+
+def test_read_file_bytes_empty_path(workspace):
+    with pytest.raises(ValueError, match="The path of the URI is empty"):
+        workspace.read_file_bytes(uri="custom://host")
+
+
 # Test LSP server restart
 def test_restart_lsp_server(workspace):
     old_process = workspace.lsp
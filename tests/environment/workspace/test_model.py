@@ -3,13 +3,11 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
-from tempfile import NamedTemporaryFile
+from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import pytest
-from pydantic import AnyUrl
 
-from ide4ai.environment.workspace.model import TextModel
 from ide4ai.environment.workspace.schema import (
     EndOfLinePreference,
     Position,
@@ -19,28 +17,14 @@ from ide4ai.environment.workspace.schema import (
 from ide4ai.environment.workspace.utils import (
     LARGE_FILE_HEAP_OPERATION_THRESHOLD,
 )
-from ide4ai.schema import LanguageId
 
 
 @pytest.fixture
-def python_text_model():
+def python_text_model(temp_text_model):
     # Create a temporary file for the test
-    with NamedTemporaryFile(mode="w+", suffix=".py", delete=True) as temp_file:
-        # Write some initial Python code to the file
-        temp_file.write("\ufeff# Sample Python File\nprint('Hello, world!')\n")
-        temp_file.flush()  # Ensure it's written to disk
-
-        # Create a TextModel instance
-        language_id = LanguageId.python  # Assuming you have a predefined LanguageId enum
-        uri = AnyUrl(f"file://{temp_file.name}")  # Using file URI for real file handling
-        model = TextModel(language_id=language_id, uri=uri)
-
-        # Yield the model to the test
+    with temp_text_model("\ufeff# Sample Python File\nprint('Hello, world!')\n") as model:
         yield model
 
-        # Cleanup: Close and remove the temporary file
-        temp_file.close()  # Make sure file is closed before removal
-
 
 # Test `set_value` method
 @pytest.mark.parametrize(
@@ -85,8 +69,8 @@ def test_save_with_tmpfile(python_text_model):
     """
     python_text_model.set_value("\ufeff# Complex Python File\nprint('Hello, world! I'am JQQ')\n")
     python_text_model.save()
-    with open(python_text_model.uri.path, encoding="utf-8") as f:
-        assert f.read() == "\ufeff# Complex Python File\nprint('Hello, world! I'am JQQ')"
+    content = Path(python_text_model.uri.path).read_bytes()
+    assert content == "\ufeff# Complex Python File\nprint('Hello, world! I'am JQQ')".encode()
 
 
 # Test `get_value` method
@@ -967,10 +951,9 @@ def test_apply_edits_with_complex_scenarios(python_text_model, edits, expected_o
 
 
 @pytest.fixture
-def text_model_multiline():
-    with NamedTemporaryFile(mode="w+", suffix=".py", delete=True) as temp_file:
-        # 写入包含多行和特殊字符的 Python 代码
-        content = """
+def text_model_multiline(temp_text_model):
+    # 写入包含多行和特殊字符的 Python 代码
+    content = """
 # Sample Python File
 print('Hello, world!')
 def hello(name):
@@ -978,16 +961,8 @@ def hello(name):
 hello("Python")
 # Another comment
 """
-        temp_file.write(content)
-        temp_file.flush()
-
-        # 创建 TextModel 实例
-        language_id = LanguageId.python
-        uri = AnyUrl(f"file://{temp_file.name}")
-        model = TextModel(language_id=language_id, uri=uri)
-
+    with temp_text_model(content) as model:
         yield model
-        temp_file.close()
 
 
 def test_basic_search(text_model_multiline):
@@ -4,12 +4,9 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 import re
-from tempfile import NamedTemporaryFile
 
 import pytest
-from pydantic import AnyUrl
 
-from ide4ai.environment.workspace.model import TextModel
 from ide4ai.environment.workspace.model_search import (
     LineFeedCounter,
     SearchParams,
@@ -17,12 +14,12 @@ from ide4ai.environment.workspace.model_search import (
     escape_regexp_characters,
 )
 from ide4ai.environment.workspace.schema import Position, Range
-from ide4ai.schema import LanguageId
 
 
-@pytest.fixture
-def python_text_model():
+@pytest.fixture(scope="module")
+def python_text_model(temp_text_model):
     # Create a TextModel instance with multiple lines of Python code
+    # 搜索测试只读不写，整个模块共享同一个模型 | Search tests are read-only, so the whole module shares one model
     content = """# Sample Python File
 class Sample:
     def hello(self):
@@ -31,17 +28,8 @@ class Sample:
     def goodbye(self):
         print("Goodbye, world!")
     """
-    with NamedTemporaryFile(mode="w+", suffix=".py", delete=True) as temp_file:
-        # Write some initial Python code to the file
-        temp_file.write(content)
-        temp_file.flush()  # Ensure it's written to disk
-        # Create a TextModel instance
-        language_id = LanguageId.python  # Assuming you have a predefined LanguageId enum
-        uri = AnyUrl(f"file://{temp_file.name}")  # Using file URI for real file handling
-        model = TextModel(language_id=language_id, uri=uri)
+    with temp_text_model(content) as model:
         yield model
-        # Cleanup: Close and remove the temporary file
-        temp_file.close()  # Make sure file is closed before removal
 
 
 def test_simple_string_search(python_text_model):
@@ -165,24 +153,16 @@ def test_create_regexp_unicode_flag():
     assert regex.flags & re.UNICODE  # Check if UNICODE flag is set
 
 
-@pytest.fixture
-def multiline_text_model():
+@pytest.fixture(scope="module")
+def multiline_text_model(temp_text_model):
     # Create a TextModel instance with multiple lines of Python code using \r\n for line breaks
+    # 同样只读，模块内共享 | Also read-only, shared within the module
     content = (
         '# Sample Python File\r\nclass Sample:\r\n    def hello(self):\r\n        print("Hello, world!")\r\n    '
         'def goodbye(self):\r\n        print("Goodbye, world!")\r\n'
     )
-    with NamedTemporaryFile(mode="w+", suffix=".py", delete=True) as temp_file:
-        # Write some initial Python code to the file
-        temp_file.write(content)
-        temp_file.flush()  # Ensure it's written to disk
-        # Create a TextModel instance
-        language_id = LanguageId.python  # Assuming you have a predefined LanguageId enum
-        uri = AnyUrl(f"file://{temp_file.name}")  # Using file URI for real file handling
-        model = TextModel(language_id=language_id, uri=uri)
+    with temp_text_model(content) as model:
         yield model
-        # Cleanup: Close and remove the temporary file
-        temp_file.close()  # Make sure file is closed before removal
 
 
 def test_line_feed_counter_usage(multiline_text_model):
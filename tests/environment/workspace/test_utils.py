@@ -3,11 +3,14 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
+import os
 import tempfile
 from pathlib import Path, PurePath
-from unittest.mock import MagicMock, mock_open, patch
+from typing import Final
+from unittest.mock import mock_open, patch
 
 import pytest
+from pydantic import AnyUrl
 
 from ide4ai.environment.workspace.schema import EndOfLineSequence
 from ide4ai.environment.workspace.utils import (
@@ -27,15 +30,26 @@ from ide4ai.environment.workspace.utils import (
     is_high_surrogate,
     is_pure_basic_ascii,
     last_non_whitespace_index,
+    load_file_content,
     next_indent_tab_stop,
     next_render_tab_stop,
     normalize_indentation,
     prev_indent_tab_stop,
     prev_render_tab_stop,
     read_file_with_bom_handling,
+    to_any_url,
     visible_width_from_column,
 )
 
+# 断言用的错误消息，模块级常量只构建一次 | Error messages used in assertions, built once as module constants
+_READ_ERR_MSG: Final = "Error reading file"
+_SIZE_ERR_MSG: Final = "File size exceeds the maximum limit of 100KB"
+_LINE_COUNT_ERR_MSG: Final = "File has more lines than the maximum allowed 300 lines"
+_CHAR_COUNT_ERR_MSG: Final = "File content exceeds the memory usage threshold of 256K characters"
+_UTF8_ERR_MSG: Final = "Only UTF-8 encoded files are supported now"
+# 只在 utils 模块内替换 open，不影响 pytest 等其他模块 | Shadow open only inside the utils module, not pytest etc.
+_UTILS_OPEN: Final = "ide4ai.environment.workspace.utils.open"
+
 
 def test_detect_newline_with_lf():
     # 模拟文件内容只有 \n 换行符
@@ -90,73 +104,65 @@ def test_detect_newline_raises_ioerror():
     with patch("builtins.open", side_effect=OSError("Failed to open")):
         with pytest.raises(ValueError) as excinfo:
             detect_newline_type(Path("/fake/path"))
-        assert "Error reading file" in str(excinfo.value)
+        assert _READ_ERR_MSG in excinfo.value.args[0]
 
 
-def test_exceeds_file_size_limit():
+def test_exceeds_file_size_limit(monkeypatch):
     # 模拟文件大小超过限制
-    with patch("os.path.getsize", return_value=LARGE_FILE_SIZE_THRESHOLD + 1):
-        with pytest.raises(ValueError) as excinfo:
-            read_file_with_bom_handling("/fake/path")
-        assert "File size exceeds the maximum limit of 100KB" in str(excinfo.value)
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=b"a" * (LARGE_FILE_SIZE_THRESHOLD + 1)), raising=False)
+    with pytest.raises(ValueError) as excinfo:
+        read_file_with_bom_handling("/fake/path")
+    assert _SIZE_ERR_MSG in excinfo.value.args[0]
 
 
-def test_exceeds_line_count_limit():
+def test_exceeds_line_count_limit(monkeypatch):
     # 模拟文件行数超过限制
     lines = ["hello\n"] * (LARGE_FILE_LINE_COUNT_THRESHOLD + 1)
     mock_file_content = "".join(lines)
-    with patch("os.path.getsize", return_value=LARGE_FILE_SIZE_THRESHOLD - 1):
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            with pytest.raises(ValueError) as excinfo:
-                read_file_with_bom_handling("/fake/path")
-            assert "File has more lines than the maximum allowed 300 lines" in str(excinfo.value)
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=mock_file_content.encode()), raising=False)
+    with pytest.raises(ValueError) as excinfo:
+        read_file_with_bom_handling("/fake/path")
+    assert _LINE_COUNT_ERR_MSG in excinfo.value.args[0]
 
 
-def test_exceeds_character_threshold():
+def test_exceeds_character_threshold(monkeypatch):
     # 模拟文件字符总数超过内存使用阈值
     single_line = "hello" * (LARGE_FILE_HEAP_OPERATION_THRESHOLD // 10) + "\n"
     num_lines = 10
     lines = [single_line] * num_lines
-    mock_file_content = "".join(lines)
-    with patch("os.path.getsize", return_value=LARGE_FILE_SIZE_THRESHOLD - 1):
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            with pytest.raises(ValueError) as excinfo:
-                read_file_with_bom_handling("/fake/path")
-            assert "File content exceeds the memory usage threshold of 256K characters" in str(excinfo.value)
+    mock_file_content = "".join(lines).encode()
+    # 放宽文件大小限制，让字符数校验先于大小校验触发 | Lift the size limit so the character check is reached first
+    monkeypatch.setattr("ide4ai.environment.workspace.utils.LARGE_FILE_SIZE_THRESHOLD", len(mock_file_content))
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=mock_file_content), raising=False)
+    with pytest.raises(ValueError) as excinfo:
+        read_file_with_bom_handling("/fake/path")
+    assert _CHAR_COUNT_ERR_MSG in excinfo.value.args[0]
 
 
-def test_file_with_bom():
+def test_file_with_bom(monkeypatch):
     # 模拟文件含有 BOM
     mock_file_content = f"{UTF_8_BOM}hello\nworld\n"
-    with patch("os.path.getsize", return_value=100):
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            bom, content = read_file_with_bom_handling("/fake/path")
-            assert bom == UTF_8_BOM
-            assert content[0] == "hello"
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=mock_file_content.encode()), raising=False)
+    bom, content = read_file_with_bom_handling("/fake/path")
+    assert bom == UTF_8_BOM
+    assert content[0] == "hello"
 
 
-def test_file_without_bom():
+def test_file_without_bom(monkeypatch):
     # 模拟文件不含 BOM
     mock_file_content = "hello\nworld\n"
-    with patch("os.path.getsize", return_value=100):
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            bom, content = read_file_with_bom_handling("/fake/path")
-            assert bom == ""
-            assert content[0] == "hello"
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=mock_file_content.encode()), raising=False)
+    bom, content = read_file_with_bom_handling("/fake/path")
+    assert bom == ""
+    assert content[0] == "hello"
 
 
-def test_non_utf8_encoded_file_raises():
+def test_non_utf8_encoded_file_raises(monkeypatch):
     # 模拟文件编码错误
-    with patch("os.path.getsize", return_value=100):
-        with patch("builtins.open") as mocked_open:
-            # 设置mock对象来模拟文件打开，并制定读取数据时触发的异常
-            mocked_file = MagicMock()
-            mocked_file.read.side_effect = UnicodeDecodeError("utf-8", b"\xff\xfe\xfa", 0, 1, "invalid start byte")
-            # 使得调用open后的返回对象支持上下文管理（with...as...）
-            mocked_open.return_value.__enter__.return_value = mocked_file
-            with pytest.raises(ValueError) as excinfo:
-                read_file_with_bom_handling("/fake/path")
-            assert "Only UTF-8 encoded files are supported now" in str(excinfo.value)
+    monkeypatch.setattr(_UTILS_OPEN, mock_open(read_data=b"\xff\xfe\xfa"), raising=False)
+    with pytest.raises(ValueError) as excinfo:
+        read_file_with_bom_handling("/fake/path")
+    assert _UTF8_ERR_MSG in excinfo.value.args[0]
 
 
 def test_is_high_surrogate_with_high_surrogate():
@@ -435,30 +441,27 @@ def test_count_eol(input_text, expected_results):
     assert count_eol(input_text) == expected_results
 
 
-# Test with LF newlines
-def test_detect_newline_type_lf():
-    with tempfile.NamedTemporaryFile() as tmp:
-        tmp.write(b"Hello\nWorld\n")
-        tmp_path = Path(tmp.name)
-        tmp.flush()
-        assert detect_newline_type(tmp_path) == EndOfLineSequence.LF
-
-
-# Test with CRLF newlines
-def test_detect_newline_type_crlf():
+# Test with LF / CRLF newlines
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"Hello\nWorld\n", EndOfLineSequence.LF),
+        (b"Hello\r\nWorld\r\n", EndOfLineSequence.CRLF),
+        ("Hello,一般来讲，Windows的文件系统使用'\\r\\n'来换行\nWorld\n".encode(), EndOfLineSequence.LF),
+    ],
+    ids=["lf", "crlf", "escaped_crlf_chars"],
+)
+def test_detect_newline_type(content, expected):
     with tempfile.NamedTemporaryFile() as tmp:
-        tmp.write(b"Hello\r\nWorld\r\n")
-        tmp_path = Path(tmp.name)
-        tmp.flush()
-        assert detect_newline_type(tmp_path) == EndOfLineSequence.CRLF
+        os.write(tmp.fileno(), content)
+        assert detect_newline_type(Path(tmp.name)) == expected
 
 
 # Test with no newlines
 def test_detect_newline_type_no_newline():
     with tempfile.NamedTemporaryFile() as tmp:
-        tmp.write(b"HelloWorld")
+        os.write(tmp.fileno(), b"HelloWorld")
         tmp_path = Path(tmp.name)
-        tmp.flush()
         res = detect_newline_type(tmp_path)
         assert res in [EndOfLineSequence.LF, EndOfLineSequence.CRLF]
 
@@ -468,12 +471,31 @@ def test_detect_newline_type_access_error():
     # Use a path that is unlikely to be permissible or exist
     with pytest.raises(ValueError) as excinfo:
         detect_newline_type(Path("/unaccessible/path/to/nonexistent/file.txt"))
-    assert "Error reading file" in str(excinfo.value)
+    assert _READ_ERR_MSG in excinfo.value.args[0]
 
 
-def test_detect_newline_type_with_crlf_char():
+def test_load_file_content_parses():
     with tempfile.NamedTemporaryFile() as tmp:
-        tmp.write("Hello,一般来讲，Windows的文件系统使用'\\r\\n'来换行\nWorld\n".encode())
-        tmp_path = Path(tmp.name)
-        tmp.flush()
-        assert detect_newline_type(tmp_path) == EndOfLineSequence.LF
+        os.write(tmp.fileno(), f"{UTF_8_BOM}Hello\r\nWorld\r\n".encode())
+        eol, bom, content = load_file_content(tmp.name)
+        assert eol == EndOfLineSequence.CRLF
+        assert bom == UTF_8_BOM
+        assert content == ["Hello", "World"]
+
+
+def test_load_file_content_errors():
+    with pytest.raises(ValueError, match=_READ_ERR_MSG):
+        load_file_content("/unaccessible/path/to/nonexistent/file.txt")
+    with tempfile.NamedTemporaryFile() as tmp:
+        os.write(tmp.fileno(), b"\xff\xfe")
+        with pytest.raises(ValueError, match=_UTF8_ERR_MSG):
+            load_file_content(tmp.name)
+        os.write(tmp.fileno(), b"a" * (LARGE_FILE_SIZE_THRESHOLD + 1))
+        with pytest.raises(ValueError, match=_SIZE_ERR_MSG):
+            load_file_content(tmp.name)
+
+
+def test_to_any_url_caches_parsed_url():
+    url = to_any_url("file:///tmp/cached.py")
+    assert url == AnyUrl("file:///tmp/cached.py")
+    assert to_any_url("file:///tmp/cached.py") is url
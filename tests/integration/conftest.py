@@ -4,7 +4,6 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 from collections.abc import Generator
-from tempfile import TemporaryDirectory
 from typing import Any
 
 import pytest
@@ -14,9 +13,11 @@ from ide4ai.python_ide.ide import PythonIDE
 
 
 @pytest.fixture(scope="module")
-def temp_dir():
-    with TemporaryDirectory() as tmpdirname:
-        yield tmpdirname
+def temp_dir(tmp_path_factory) -> str:
+    # 建在 pytest 的 basetemp 下：pytest-xdist 为每个 worker 分配独立 basetemp，numbered 目录保证模块间互不冲突
+    # Lives under pytest's basetemp: pytest-xdist gives every worker its own basetemp, and numbered dirs keep
+    # modules apart
+    return str(tmp_path_factory.mktemp("ide", numbered=True))
 
 
 @pytest.fixture(scope="module")
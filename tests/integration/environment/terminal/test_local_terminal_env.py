@@ -102,9 +102,8 @@ def test_command_execute_failed(terminal_env):
 
 def test_command_execution_ls(terminal_env):
     with tempfile.TemporaryDirectory() as tmp_dir:
-        new_file = tmp_dir + "/test_for_u.py"
-        with open(new_file, "w") as f:
-            f.write("print('hello world')")
+        # ls 只关心文件是否存在，无需写入内容 / ls only needs the file to exist, its content is irrelevant
+        Path(tmp_dir, "test_for_u.py").touch()
         # Prepare the action dictionary
         action = {"category": "terminal", "action_name": "ls", "action_args": f"{tmp_dir}"}
 
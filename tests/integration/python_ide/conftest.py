@@ -0,0 +1,36 @@
+# filename: conftest.py
+# @Time    : 2026/10/16
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+import os
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+_VIRTUAL_PROJECT = Path(__file__).parent / "virtual_project"
+_SHM_DIR = Path("/dev/shm")
+
+
+@pytest.fixture(scope="session")
+def project_root_dir(tmp_path_factory) -> Generator[str, Any, None]:
+    """
+    将 virtual_project 复制一份供整个会话使用。Linux 上复制到 /dev/shm（tmpfs），避免反复遍历、读取磁盘目录；
+    测试对文件的修改也不会影响仓库中的原始文件
+
+    Copy virtual_project once for the whole session. On Linux the copy lives in /dev/shm (tmpfs), so repeated walks
+    and reads do not touch the disk, and edits made by tests never reach the checked-in files.
+
+    Returns:
+        str: 项目根目录 | Project root directory
+    """
+    if _SHM_DIR.is_dir() and os.access(_SHM_DIR, os.W_OK):
+        root = _SHM_DIR / f"ide4ai-virtual-project-{os.getpid()}"
+    else:
+        root = tmp_path_factory.mktemp("virtual_project")
+    shutil.copytree(_VIRTUAL_PROJECT, root, dirs_exist_ok=True, ignore=shutil.ignore_patterns("__pycache__"))
+    yield str(root)
+    shutil.rmtree(root, ignore_errors=True)
@@ -24,6 +24,7 @@ Comprehensive tests for:
 import os
 import tempfile
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any
 
 import pytest
@@ -38,15 +39,16 @@ from ide4ai.python_ide.utils import (
 
 
 @pytest.fixture
-def temp_python_module() -> Generator[str, Any, None]:
+def temp_python_module(tmp_path) -> str:
     """
     创建临时Python模块文件 | Create temporary Python module file
 
     Returns:
         str: 临时文件路径 | Temporary file path
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=True, encoding="utf-8") as f:
-        f.write('''"""\n这是一个测试模块 | This is a test module
+    path = tmp_path / "module.py"
+    path.write_text(
+        '''"""\n这是一个测试模块 | This is a test module
 
 用于测试模块信息提取功能
 For testing module info extraction
@@ -65,66 +67,73 @@ def func2():
 class TestClass:
     """测试类 | Test class"""
     pass
-''')
-        f.flush()  # 确保内容写入磁盘 | Ensure content is written to disk
-        yield f.name
+''',
+        encoding="utf-8",
+    )
+    return str(path)
 
 
 @pytest.fixture
-def temp_python_module_no_all() -> Generator[str, Any, None]:
+def temp_python_module_no_all(tmp_path) -> str:
     """
     创建没有__all__定义的临时Python模块 | Create temporary Python module without __all__
 
     Returns:
         str: 临时文件路径 | Temporary file path
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=True, encoding="utf-8") as f:
-        f.write('''"""简单的测试模块 | Simple test module"""
+    path = tmp_path / "module_no_all.py"
+    path.write_text(
+        '''"""简单的测试模块 | Simple test module"""
 
 def simple_func():
     pass
-''')
-        f.flush()  # 确保内容写入磁盘 | Ensure content is written to disk
-        yield f.name
+''',
+        encoding="utf-8",
+    )
+    return str(path)
 
 
 @pytest.fixture
-def temp_python_module_no_docstring() -> Generator[str, Any, None]:
+def temp_python_module_no_docstring(tmp_path) -> str:
     """
     创建没有docstring的临时Python模块 | Create temporary Python module without docstring
 
     Returns:
         str: 临时文件路径 | Temporary file path
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=True, encoding="utf-8") as f:
-        f.write("""__all__ = ["item1", "item2"]
+    path = tmp_path / "module_no_docstring.py"
+    path.write_text(
+        """__all__ = ["item1", "item2"]
 
 def item1():
     pass
 
 def item2():
     pass
-""")
-        f.flush()  # 确保内容写入磁盘 | Ensure content is written to disk
-        yield f.name
+""",
+        encoding="utf-8",
+    )
+    return str(path)
 
 
 @pytest.fixture
-def temp_python_module_syntax_error() -> Generator[str, Any, None]:
+def temp_python_module_syntax_error(tmp_path) -> str:
     """
     创建有语法错误的临时Python模块 | Create temporary Python module with syntax error
 
     Returns:
         str: 临时文件路径 | Temporary file path
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=True, encoding="utf-8") as f:
-        f.write('''"""有语法错误的模块"""
+    path = tmp_path / "module_syntax_error.py"
+    path.write_text(
+        '''"""有语法错误的模块"""
 
 def broken_func(
     # 缺少闭合括号 | Missing closing parenthesis
-''')
-        f.flush()  # 确保内容写入磁盘 | Ensure content is written to disk
-        yield f.name
+''',
+        encoding="utf-8",
+    )
+    return str(path)
 
 
 @pytest.fixture
@@ -306,8 +315,7 @@ class TestCollectPackageInfo:
         # 创建一个包含空__init__.py的目录 | Create directory with empty __init__.py
         empty_init_dir = os.path.join(temp_project_structure, "empty_pkg")
         os.makedirs(empty_init_dir)
-        with open(os.path.join(empty_init_dir, "__init__.py"), "w", encoding="utf-8") as f:
-            f.write("")
+        Path(empty_init_dir, "__init__.py").touch()
 
         _collect_package_info(empty_init_dir, "empty_pkg", descriptions)
 
@@ -3,12 +3,13 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
+import contextlib
 import os
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any
 
 import pytest
-from pydantic import AnyUrl
 
 from ide4ai.environment.workspace.schema import (
     Position,
@@ -18,19 +19,19 @@ from ide4ai.environment.workspace.schema import (
 from ide4ai.python_ide.const import DEFAULT_SYMBOL_VALUE_SET
 from ide4ai.python_ide.workspace import PyWorkspace
 
-
-@pytest.fixture
-def project_root_dir() -> str:
-    return os.path.dirname(__file__) + "/virtual_project"
+_FILE_SCHEME = "file://"
 
 
 @pytest.fixture
-def py_workspace(project_root_dir) -> Generator[PyWorkspace, Any, None]:
+def py_workspace(request, project_root_dir) -> Generator[PyWorkspace, Any, None]:
+    # 可通过 indirect 参数化传入 header_generators，默认使用 PyWorkspace 的默认文件头生成器
+    # header_generators can be passed via indirect parametrization, defaults to PyWorkspace's default header generators
     # 使用更长的超时时间以适应低配置电脑 / Use longer timeout for low-spec computers
     workspace = PyWorkspace(
         root_dir=project_root_dir,
         project_name="test_python_workspace",
         diagnostics_timeout=15.0,  # 增加到15秒 / Increase to 15 seconds
+        header_generators=getattr(request, "param", None),
     )
     yield workspace
     workspace.close()
@@ -50,12 +51,12 @@ def test_py_workspace_init(py_workspace) -> None:
 
 def test_py_workspace_read_file(project_root_dir, py_workspace) -> None:
     test_file_path = project_root_dir + "/file_for_test_read.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
     content = py_workspace.read_file(uri=test_file_uri)
     print(content)
-    with open(test_file_path) as f:
-        read_res = f.read()
-    assert read_res[:20] in content  # 因为文件较大，直接使用in判断会比较慢，所以截取20个字符做判断
+    with open(test_file_path, "rb") as f:
+        prefix = f.read(20).decode("utf-8", "ignore")
+    assert prefix in content[:200]  # 因为文件较大，只读取前20个字节，并只在内容头部判断
     print(f"内容长度: {len(content)}")
 
 
@@ -74,14 +75,20 @@ def test_py_workspace_render(project_root_dir, py_workspace) -> None:
     """
     render_1 = project_root_dir + "/file_for_render_1.py"
     current_file = project_root_dir + "/file_for_test_read.py"
-    py_workspace.open_file(uri=f"file://{render_1}")
-    py_workspace.open_file(uri=f"file://{current_file}")
-    assert AnyUrl(f"file://{current_file}") == py_workspace.active_models[-1].uri
-    py_workspace.active_model(py_workspace.get_model(uri=f"file://{render_1}").m_id)
-    assert AnyUrl(f"file://{render_1}") == py_workspace.active_models[-1].uri
-    py_workspace.active_model(py_workspace.get_model(uri=f"file://{current_file}").m_id)
+    py_workspace.open_files(
+        uris=[_FILE_SCHEME + current_file, _FILE_SCHEME + render_1],
+        active=_FILE_SCHEME + current_file,
+    )
+    assert [_FILE_SCHEME + render_1, _FILE_SCHEME + current_file] == [str(m.uri) for m in py_workspace.active_models]
     text = py_workspace.render()
-    assert "当前工作区" in text and "Class: LSPCommand" in text
+    # 工作区标题位于开头，符号信息位于当前文件内容之前，只需在头部有限范围内查找
+    # The workspace title is at the very start and symbols precede the current file content, so bound the search
+    assert text.startswith("当前工作区") and text.find("Class: LSPCommand", 0, 8192) >= 0
+    with pytest.raises(ValueError):
+        py_workspace.open_files(
+            uris=[_FILE_SCHEME + render_1],
+            active=f"{_FILE_SCHEME}{project_root_dir}/not_opened.py",
+        )
 
 
 def test_py_workspace_create_and_apply_edit(project_root_dir, py_workspace) -> None:
@@ -96,11 +103,10 @@ def test_py_workspace_create_and_apply_edit(project_root_dir, py_workspace) -> N
 
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     # 备份原始文件内容 / Backup original file content
-    with open(test_file_path) as f:
-        original_content = f.read()
+    original_content = Path(test_file_path).read_bytes()
 
     try:
         py_workspace.open_file(uri=test_file_uri)
@@ -129,27 +135,53 @@ def test_py_workspace_create_and_apply_edit(project_root_dir, py_workspace) -> N
         assert "Class: A" in symbols
     finally:
         # 恢复原始文件内容 / Restore original file content
-        with open(test_file_path, "w") as f:
-            f.write(original_content)
+        Path(test_file_path).write_bytes(original_content)
 
 
 @pytest.fixture
-def file_uri(project_root_dir) -> str:
-    return f"file://{project_root_dir}/testfile.py"
+def file_path(project_root_dir) -> str:
+    return f"{project_root_dir}/testfile.py"
 
 
-def test_create_file_success(py_workspace, file_uri) -> None:
+@pytest.fixture
+def file_uri(file_path) -> str:
+    return _FILE_SCHEME + file_path
+
+
+@pytest.mark.parametrize(
+    ("preexisting", "kwargs", "expect"),
+    [
+        (False, {}, "created"),
+        (True, {"overwrite": True}, "created"),
+        (True, {"ignore_if_exists": True}, "ignored"),
+        (True, {}, "raises"),
+    ],
+    ids=["create_new", "overwrite_existing", "ignore_existing", "error_when_exists"],
+)
+def test_create_file(py_workspace, file_uri, file_path, preexisting, kwargs, expect) -> None:
     """
-    测试成功创建一个新文件。
+    测试创建文件：新建成功；文件已存在时 overwrite=True 覆盖、ignore_if_exists=True 不做任何操作、未设置二者时抛出异常。
     """
-    tm, diagnostics = py_workspace.create_file(uri=file_uri)
+    if preexisting:
+        # 先创建一个文件
+        py_workspace.create_file(uri=file_uri)
+    if expect == "raises":
+        with pytest.raises(FileExistsError):
+            py_workspace.create_file(uri=file_uri, **kwargs)
+        return
+    tm, diagnostics = py_workspace.create_file(uri=file_uri, **kwargs)
+    if expect == "ignored":
+        assert tm is None
+        assert diagnostics is None
+        return
     assert tm is not None
-    # 诊断信息可能为None（超时）或有值 / Diagnostics may be None (timeout) or have value
-    # 主要验证返回值结构正确，包含两个元素 / Mainly verify return structure is correct with two elements
-    assert os.path.exists(file_uri[7:])  # Removing 'file://' prefix
+    if preexisting:
+        assert diagnostics is not None
+    # 新建文件时诊断信息可能为None（超时）或有值 / For a new file diagnostics may be None (timeout) or have value
+    assert os.path.exists(file_path)
 
 
-def test_create_file_with_init_content(py_workspace, file_uri) -> None:
+def test_create_file_with_init_content(py_workspace, file_uri, file_path) -> None:
     """
     测试创建文件时指定初始内容。
     """
@@ -157,62 +189,25 @@ def test_create_file_with_init_content(py_workspace, file_uri) -> None:
     tm.save()
     assert tm is not None
     assert diagnostics is not None
-    assert os.path.exists(file_uri[7:])
-    with open(file_uri[7:]) as f:
-        content = f.read()
-    assert content.endswith("print('Hello, World!')") and content.startswith("# -*- coding: utf-8 -*-")
+    assert os.path.exists(file_path)
+    # 只读取文件头尾，文件头生成后文件可能较大 / Read only the head and tail, the generated header may make the file large
+    with open(file_path, "rb") as f:
+        head = f.read(64)
+        f.seek(-32, os.SEEK_END)
+        tail = f.read()
+    assert tail.endswith(b"print('Hello, World!')") and head.startswith(b"# -*- coding: utf-8 -*-")
 
 
-def test_create_file_with_not_header_generator(project_root_dir, file_uri) -> None:
+@pytest.mark.parametrize("py_workspace", [{}], indirect=True)
+def test_create_file_with_not_header_generator(py_workspace, file_uri, file_path) -> None:
     """如果PyWorkspace没有header_generator，不会添加文件头"""
-    py_workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_python_workspace", header_generators={})
-    try:
-        tm, diagnostics = py_workspace.create_file(uri=file_uri, init_content="print(undefined_var)")
-        tm.save()
-        assert tm is not None
-        assert diagnostics is not None
-        assert os.path.exists(file_uri[7:])
-        with open(file_uri[7:]) as f:
-            content = f.read()
-        assert content.endswith("print(undefined_var)") and content.startswith("print(undefined_var)")
-    finally:
-        py_workspace.close()
-
-
-def test_overwrite_existing_file(py_workspace, file_uri) -> None:
-    """
-    测试如果文件存在，设置overwrite=True后能成功覆盖文件。
-    """
-    # 先创建一个文件
-    py_workspace.create_file(uri=file_uri)
-    # 再次创建同一文件并尝试覆盖
-    tm, diagnostics = py_workspace.create_file(uri=file_uri, overwrite=True)
+    tm, diagnostics = py_workspace.create_file(uri=file_uri, init_content="print(undefined_var)")
+    tm.save()
     assert tm is not None
     assert diagnostics is not None
-    assert os.path.exists(file_uri[7:])
-
-
-def test_ignore_existing_file(py_workspace, file_uri) -> None:
-    """
-    测试如果文件存在，并设置ignore_if_exists=True，不进行任何操作。
-    """
-    # 先创建一个文件
-    py_workspace.create_file(uri=file_uri)
-    # 再次创建同一文件并设置忽略存在的文件
-    tm, diagnostics = py_workspace.create_file(uri=file_uri, ignore_if_exists=True)
-    assert tm is None
-    assert diagnostics is None
-
-
-def test_error_when_file_exists_without_overwrite(py_workspace, file_uri) -> None:
-    """
-    测试文件已存在且没有设置覆盖时应抛出异常。
-    """
-    # 先创建一个文件
-    py_workspace.create_file(uri=file_uri)
-    # 再次创建同一文件，没有设置overwrite或ignore_if_exists
-    with pytest.raises(FileExistsError):
-        py_workspace.create_file(uri=file_uri)
+    assert os.path.exists(file_path)
+    content = Path(file_path).read_bytes()
+    assert content.endswith(b"print(undefined_var)") and content.startswith(b"print(undefined_var)")
 
 
 def test_handle_creation_error(py_workspace, file_uri, monkeypatch) -> None:
@@ -223,7 +218,9 @@ def test_handle_creation_error(py_workspace, file_uri, monkeypatch) -> None:
     def mock_open(*args, **kwargs):
         raise PermissionError("Permission denied")
 
-    monkeypatch.setattr("builtins.open", mock_open)
+    # 仅替换 workspace 模块内的 open，避免影响日志、pytest 捕获等其他模块的文件操作
+    # Only shadow open inside the workspace module, so logging, pytest capture etc. keep using the real builtin
+    monkeypatch.setattr("ide4ai.python_ide.workspace.open", mock_open, raising=False)
     with pytest.raises(IOError) as exc_info:
         py_workspace.create_file(uri=file_uri)
     assert "Permission denied" in str(exc_info.value)
@@ -231,18 +228,17 @@ def test_handle_creation_error(py_workspace, file_uri, monkeypatch) -> None:
 
 # 使用fixture清理创建的文件
 @pytest.fixture(autouse=True)
-def clean_up(file_uri):
+def clean_up(file_path):
     yield
-    file_path = file_uri[7:]
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(file_path)
 
 
 def test_step_open_file_success(py_workspace, project_root_dir):
     action = {
         "category": "workspace",
         "action_name": "open_file",
-        "action_args": {"uri": f"file://{project_root_dir}/file_for_test_read.py"},
+        "action_args": {"uri": f"{_FILE_SCHEME}{project_root_dir}/file_for_test_read.py"},
     }
     observation, reward, done, success, _ = py_workspace.step(action)
     assert success is True
@@ -256,7 +252,7 @@ def test_step_apply_edit_success(py_workspace, project_root_dir):
         "category": "workspace",
         "action_name": "apply_edit",
         "action_args": {
-            "uri": f"file://{project_root_dir}/file_for_test.py",
+            "uri": f"{_FILE_SCHEME}{project_root_dir}/file_for_test.py",
             "edits": [],
         },
     }
@@ -287,7 +283,7 @@ def test_function():
         )
         temp_file_path = f.name
 
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
     workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_auto_diagnostics")
 
     try:
@@ -334,7 +330,7 @@ def test_create_file_with_auto_diagnostics(project_root_dir) -> None:
     """
 
     temp_file_path = os.path.join(project_root_dir, "test_new_file_with_error.py")
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
     workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_create_diagnostics")
 
     try:
@@ -385,7 +381,7 @@ def valid_function():
         )
         temp_file_path = f.name
 
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
     workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_syntax_error_diagnostics")
 
     try:
@@ -454,7 +450,7 @@ def test_create_file_with_syntax_error_must_have_diagnostics(project_root_dir) -
     """
 
     temp_file_path = os.path.join(project_root_dir, "test_file_with_multiple_errors.py")
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
     workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_create_syntax_error")
 
     try:
@@ -541,7 +537,7 @@ print(os.path)
         )
         temp_file_path = f.name
 
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
 
     # 创建workspace实例 / Create workspace instance
     workspace = PyWorkspace(root_dir=project_root_dir, project_name="test_diagnostics_workspace")
@@ -550,7 +546,7 @@ print(os.path)
         # 1. 使用workspace的open_file方法打开文件 / Use workspace's open_file method to open file
         text_model = workspace.open_file(uri=temp_file_uri)
         assert text_model is not None, "文件打开失败 / Failed to open file"
-        assert text_model.uri == AnyUrl(temp_file_uri), "文件URI不匹配 / File URI mismatch"
+        assert str(text_model.uri) == temp_file_uri, "文件URI不匹配 / File URI mismatch"
 
         # 2. 使用workspace的apply_edit方法编辑文件 / Use workspace's apply_edit method to edit file
         # 在第一行第二个字符位置插入字符'a' / Insert character 'a' at position (1, 2)
@@ -592,8 +588,8 @@ print(os.path)
         )
 
         # 5. 测试读取文件内容 / Test reading file content
-        file_content = workspace.read_file(uri=temp_file_uri, with_line_num=True)
-        assert "os.path" in file_content, "文件内容读取异常 / File content reading error"
+        file_bytes = workspace.read_file_bytes(uri=temp_file_uri)
+        assert b"os.path" in file_bytes, "文件内容读取异常 / File content reading error"
 
         # 6. 测试获取文件symbols / Test getting file symbols
         symbols = workspace.get_file_symbols(uri=temp_file_uri, kinds=DEFAULT_SYMBOL_VALUE_SET)
@@ -618,11 +614,10 @@ def test_replace_in_file_basic(project_root_dir, py_workspace) -> None:
     Verify that replace_in_file correctly replaces text and returns undo_edits and diagnostics
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     # 备份原始文件内容 / Backup original file content
-    with open(test_file_path) as f:
-        original_content = f.read()
+    original_content = Path(test_file_path).read_bytes()
 
     try:
         py_workspace.open_file(uri=test_file_uri)
@@ -657,8 +652,7 @@ def test_replace_in_file_basic(project_root_dir, py_workspace) -> None:
 
     finally:
         # 恢复原始文件内容 / Restore original file content
-        with open(test_file_path, "w") as f:
-            f.write(original_content)
+        Path(test_file_path).write_bytes(original_content)
 
 
 def test_replace_in_file_with_regex(project_root_dir, py_workspace) -> None:
@@ -669,11 +663,10 @@ def test_replace_in_file_with_regex(project_root_dir, py_workspace) -> None:
     Verify that replace_in_file can use regex for replacement
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     # 备份原始文件内容 / Backup original file content
-    with open(test_file_path) as f:
-        original_content = f.read()
+    original_content = Path(test_file_path).read_bytes()
 
     try:
         py_workspace.open_file(uri=test_file_uri)
@@ -697,8 +690,7 @@ def test_replace_in_file_with_regex(project_root_dir, py_workspace) -> None:
 
     finally:
         # 恢复原始文件内容 / Restore original file content
-        with open(test_file_path, "w") as f:
-            f.write(original_content)
+        Path(test_file_path).write_bytes(original_content)
 
 
 def test_replace_in_file_with_range(project_root_dir, py_workspace) -> None:
@@ -709,11 +701,10 @@ def test_replace_in_file_with_range(project_root_dir, py_workspace) -> None:
     Verify that replace_in_file can replace within a specific range
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     # 备份原始文件内容 / Backup original file content
-    with open(test_file_path) as f:
-        original_content = f.read()
+    original_content = Path(test_file_path).read_bytes()
 
     try:
         py_workspace.open_file(uri=test_file_uri)
@@ -744,8 +735,7 @@ def test_replace_in_file_with_range(project_root_dir, py_workspace) -> None:
 
     finally:
         # 恢复原始文件内容 / Restore original file content
-        with open(test_file_path, "w") as f:
-            f.write(original_content)
+        Path(test_file_path).write_bytes(original_content)
 
 
 def test_replace_in_file_no_match(project_root_dir, py_workspace) -> None:
@@ -756,7 +746,7 @@ def test_replace_in_file_no_match(project_root_dir, py_workspace) -> None:
     Verify that replace_in_file returns (None, None) when no match is found
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     py_workspace.open_file(uri=test_file_uri)
 
@@ -781,11 +771,10 @@ def test_replace_in_file_case_sensitive(project_root_dir, py_workspace) -> None:
     Verify that replace_in_file correctly handles case-sensitive replacement
     """
     test_file_path = project_root_dir + "/file_for_edit.py"
-    test_file_uri = "file://" + test_file_path
+    test_file_uri = _FILE_SCHEME + test_file_path
 
     # 备份原始文件内容 / Backup original file content
-    with open(test_file_path) as f:
-        original_content = f.read()
+    original_content = Path(test_file_path).read_bytes()
 
     try:
         py_workspace.open_file(uri=test_file_uri)
@@ -817,8 +806,7 @@ def test_replace_in_file_case_sensitive(project_root_dir, py_workspace) -> None:
 
     finally:
         # 恢复原始文件内容 / Restore original file content
-        with open(test_file_path, "w") as f:
-            f.write(original_content)
+        Path(test_file_path).write_bytes(original_content)
 
 
 def test_replace_in_file_with_diagnostics(project_root_dir) -> None:
@@ -842,7 +830,7 @@ def valid_function():
         )
         temp_file_path = f.name
 
-    temp_file_uri = f"file://{temp_file_path}"
+    temp_file_uri = _FILE_SCHEME + temp_file_path
     workspace = PyWorkspace(
         root_dir=project_root_dir,
         project_name="test_replace_diagnostics",
@@ -886,7 +874,7 @@ def test_find_in_folder(project_root_dir: str, py_workspace: PyWorkspace) -> Non
     测试在文件夹中搜索功能 / Test find in folder functionality
     """
     # 在整个项目文件夹中搜索 "def" / Search for "def" in the entire project folder
-    folder_uri = f"file://{project_root_dir}"
+    folder_uri = _FILE_SCHEME + project_root_dir
     results = py_workspace.find_in_path(uri=folder_uri, query="def", match_case=True)
 
     # 验证返回了结果 / Verify results are returned
@@ -904,7 +892,7 @@ def test_find_in_folder_with_limit(project_root_dir: str, py_workspace: PyWorksp
     """
     测试在文件夹中搜索时使用结果限制 / Test find in folder with result limit
     """
-    folder_uri = f"file://{project_root_dir}"
+    folder_uri = _FILE_SCHEME + project_root_dir
 
     # 限制返回5个结果 / Limit to 5 results
     results = py_workspace.find_in_path(uri=folder_uri, query="def", limit_result_count=5)
@@ -919,7 +907,7 @@ def test_find_in_folder_with_regex(project_root_dir: str, py_workspace: PyWorksp
     """
     测试在文件夹中使用正则表达式搜索 / Test find in folder with regex
     """
-    folder_uri = f"file://{project_root_dir}"
+    folder_uri = _FILE_SCHEME + project_root_dir
 
     # 使用正则表达式搜索函数定义 / Search for function definitions using regex
     results = py_workspace.find_in_path(uri=folder_uri, query=r"class\s+\w+", is_regex=True)
@@ -935,11 +923,11 @@ def test_find_in_file_vs_folder(project_root_dir: str, py_workspace: PyWorkspace
     测试在单个文件和文件夹中搜索的区别 / Test difference between searching in file vs folder
     """
     # 在单个文件中搜索 / Search in a single file
-    file_uri = f"file://{project_root_dir}/file_for_test_read.py"
+    file_uri = f"{_FILE_SCHEME}{project_root_dir}/file_for_test_read.py"
     file_results = py_workspace.find_in_path(uri=file_uri, query="def")
 
     # 在整个文件夹中搜索 / Search in the entire folder
-    folder_uri = f"file://{project_root_dir}"
+    folder_uri = _FILE_SCHEME + project_root_dir
     folder_results = py_workspace.find_in_path(uri=folder_uri, query="def")
 
     # 文件夹搜索结果应该包含文件搜索结果 / Folder search should include file search results
@@ -955,7 +943,7 @@ def test_find_in_folder_with_search_scope_error(project_root_dir: str, py_worksp
     """
     测试在文件夹搜索时使用 search_scope 参数应该报错 / Test that using search_scope with folder search raises error
     """
-    folder_uri = f"file://{project_root_dir}"
+    folder_uri = _FILE_SCHEME + project_root_dir
 
     # 尝试在文件夹搜索时使用 search_scope，应该抛出 ValueError / Try to use search_scope with folder search, should raise ValueError
     with pytest.raises(ValueError, match="search_scope"):
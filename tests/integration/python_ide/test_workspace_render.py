@@ -20,24 +20,86 @@ Comprehensive tests for render function:
 """
 
 import os
+import re
 import tempfile
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any
 
 import pytest
 
 from ide4ai.python_ide.workspace import PyWorkspace
 
+# 使用模块级共享工作区的测试放在同一个 xdist worker 上（pytest -n auto --dist loadgroup），共享工作区及其 LSP 只启动一次；
+# 每个 worker 都有自己的 virtual_project 副本，因此分组只为复用工作区，其余测试可自由并行
+# Tests using the module-scoped shared workspaces stay on one xdist worker (pytest -n auto --dist loadgroup), so the
+# shared workspaces and their LSP servers start only once. Every worker has its own virtual_project copy, so the group
+# only serves workspace reuse; the remaining tests run freely in parallel
+shared_workspace = pytest.mark.xdist_group("shared_workspace")
 
-@pytest.fixture
-def project_root_dir() -> str:
-    """项目根目录 | Project root directory"""
-    return os.path.dirname(__file__) + "/virtual_project"
+MAKEFILE_TEXT = """# Test Makefile
+.PHONY: all clean test
+
+all: build
+
+build:
+\t@echo "Building..."
 
+test:
+\t@echo "Testing..."
+
+clean:
+\t@echo "Cleaning..."
 
-@pytest.fixture
+install:
+\t@echo "Installing..."
+"""
+
+MAKEFILE_PROJECT_MAIN_TEXT = "# -*- coding: utf-8 -*-\n# Test file\ndef main():\n    pass\n"
+
+COMMON_MK_TEXT = """# Common makefile
+compile:
+\t@echo "Compiling..."
+
+link:
+\t@echo "Linking..."
+"""
+
+CONFIG_MK_TEXT = """# Config makefile
+setup:
+\t@echo "Setup..."
+
+configure:
+\t@echo "Configure..."
+"""
+
+# test_render_complete_workflow 需要在render输出中找到的内容 | Content test_render_complete_workflow expects in the output
+_WORKFLOW_NEEDLES = (
+    # 项目信息与目录结构 | Project info and directory structure
+    "当前工作区: integration_test_project",
+    "项目目录结构",
+    "src/",
+    "tests/",
+    # 快捷命令 | Shortcut commands
+    "项目快捷命令",
+    "make build",
+    "make test",
+    # 文件内容 | File content
+    "以下是最近使用的文件其结构信息与关键Symbols信息",
+    "当前打开的文件内容如下",
+    "test_main",
+)
+_WORKFLOW_NEEDLE_RE = re.compile("|".join(re.escape(needle) for needle in _WORKFLOW_NEEDLES))
+
+
+def _write(path: str | os.PathLike, text: str) -> None:
+    """以UTF-8写入文本文件 | Write a text file as UTF-8"""
+    Path(path).write_text(text, encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
 def py_workspace(project_root_dir) -> Generator[PyWorkspace, Any, None]:
-    """PyWorkspace实例 | PyWorkspace instance"""
+    """PyWorkspace实例，模块内共享 | PyWorkspace instance, shared within the module"""
     workspace = PyWorkspace(
         root_dir=project_root_dir,
         project_name="test_render_workspace",
@@ -47,92 +109,86 @@ def py_workspace(project_root_dir) -> Generator[PyWorkspace, Any, None]:
     workspace.close()
 
 
-@pytest.fixture
-def temp_workspace_with_makefile() -> Generator[tuple[str, PyWorkspace], Any, None]:
+@pytest.fixture(scope="session")
+def _makefile_tree(tmp_path_factory) -> Path:
     """
-    创建带Makefile的临时工作区 | Create temporary workspace with Makefile
+    带Makefile的项目目录树，整个会话只在磁盘上创建一次 | Project tree with a Makefile, created on disk once per session
 
     Returns:
-        tuple[str, PyWorkspace]: (临时目录路径, workspace实例) | (temp dir path, workspace instance)
+        Path: 目录树根目录 | Root of the tree
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # 创建一个Makefile | Create a Makefile
-        makefile_path = os.path.join(temp_dir, "Makefile")
-        with open(makefile_path, "w", encoding="utf-8") as f:
-            f.write("""# Test Makefile
-.PHONY: all clean test
-
-all: build
-
-build:
-\t@echo "Building..."
-
-test:
-\t@echo "Testing..."
-
-clean:
-\t@echo "Cleaning..."
-
-install:
-\t@echo "Installing..."
-""")
+    root = tmp_path_factory.mktemp("makefile_project")
+    (root / "Makefile").write_text(MAKEFILE_TEXT, encoding="utf-8")
+    # 创建一些测试文件和目录结构 | Create test files and directory structure
+    (root / "src").mkdir()
+    (root / "tests").mkdir()
+    (root / "src" / "main.py").write_text(MAKEFILE_PROJECT_MAIN_TEXT, encoding="utf-8")
+    return root
 
-        # 创建一些测试文件和目录结构 | Create test files and directory structure
-        os.makedirs(os.path.join(temp_dir, "src"), exist_ok=True)
-        os.makedirs(os.path.join(temp_dir, "tests"), exist_ok=True)
 
-        test_file = os.path.join(temp_dir, "src", "main.py")
-        with open(test_file, "w", encoding="utf-8") as f:
-            f.write("# -*- coding: utf-8 -*-\n# Test file\ndef main():\n    pass\n")
+@pytest.fixture(scope="session")
+def _mk_files_tree(tmp_path_factory) -> Path:
+    """
+    带.mk文件的项目目录树，整个会话只在磁盘上创建一次 | Project tree with .mk files, created on disk once per session
 
-        workspace = PyWorkspace(root_dir=temp_dir, project_name="test_makefile_workspace", diagnostics_timeout=15.0)
-        yield temp_dir, workspace
-        workspace.close()
+    Returns:
+        Path: 目录树根目录 | Root of the tree
+    """
+    root = tmp_path_factory.mktemp("mk_files_project")
+    (root / "common.mk").write_text(COMMON_MK_TEXT, encoding="utf-8")
+    (root / "config.mk").write_text(CONFIG_MK_TEXT, encoding="utf-8")
+    (root / "test.py").write_text("# Test\nprint('hello')\n", encoding="utf-8")
+    return root
 
 
-@pytest.fixture
-def temp_workspace_with_mk_files() -> Generator[tuple[str, PyWorkspace], Any, None]:
+@pytest.fixture(scope="module")
+def temp_workspace_with_makefile(_makefile_tree) -> Generator[tuple[str, PyWorkspace], Any, None]:
     """
-    创建带.mk文件的临时工作区 | Create temporary workspace with .mk files
+    创建带Makefile的临时工作区，模块内共享 | Create temporary workspace with Makefile, shared within the module
 
     Returns:
         tuple[str, PyWorkspace]: (临时目录路径, workspace实例) | (temp dir path, workspace instance)
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # 创建多个.mk文件 | Create multiple .mk files
-        common_mk = os.path.join(temp_dir, "common.mk")
-        with open(common_mk, "w", encoding="utf-8") as f:
-            f.write("""# Common makefile
-compile:
-\t@echo "Compiling..."
+    temp_dir = str(_makefile_tree)
+    workspace = PyWorkspace(root_dir=temp_dir, project_name="test_makefile_workspace", diagnostics_timeout=15.0)
+    yield temp_dir, workspace
+    workspace.close()
 
-link:
-\t@echo "Linking..."
-""")
 
-        config_mk = os.path.join(temp_dir, "config.mk")
-        with open(config_mk, "w", encoding="utf-8") as f:
-            f.write("""# Config makefile
-setup:
-\t@echo "Setup..."
+@pytest.fixture(scope="module")
+def temp_workspace_with_mk_files(_mk_files_tree) -> Generator[tuple[str, PyWorkspace], Any, None]:
+    """
+    创建带.mk文件的临时工作区，模块内共享 | Create temporary workspace with .mk files, shared within the module
 
-configure:
-\t@echo "Configure..."
-""")
+    Returns:
+        tuple[str, PyWorkspace]: (临时目录路径, workspace实例) | (temp dir path, workspace instance)
+    """
+    temp_dir = str(_mk_files_tree)
+    workspace = PyWorkspace(root_dir=temp_dir, project_name="test_mk_workspace", diagnostics_timeout=15.0)
+    yield temp_dir, workspace
+    workspace.close()
 
-        # 创建测试文件 | Create test file
-        test_file = os.path.join(temp_dir, "test.py")
-        with open(test_file, "w", encoding="utf-8") as f:
-            f.write("# Test\nprint('hello')\n")
 
-        workspace = PyWorkspace(root_dir=temp_dir, project_name="test_mk_workspace", diagnostics_timeout=15.0)
-        yield temp_dir, workspace
-        workspace.close()
+@pytest.fixture(autouse=True)
+def _reset_workspace(request) -> None:
+    """
+    关闭前一个测试在共享工作区中打开的文件，避免active_models在测试之间泄漏
+    Close files left open in the shared workspaces by a previous test, so active_models do not leak between tests
+    """
+    for name in ("py_workspace", "temp_workspace_with_makefile", "temp_workspace_with_mk_files"):
+        if name not in request.fixturenames:
+            continue
+        workspace = request.getfixturevalue(name)
+        if isinstance(workspace, tuple):
+            workspace = workspace[1]
+        for model in list(workspace.models):
+            workspace.close_file(uri=str(model.uri))
 
 
 class TestRenderBasic:
     """基础render功能测试 | Basic render functionality tests"""
 
+    @shared_workspace
     def test_render_without_active_models(self, py_workspace):
         """
         测试没有active_models时的render输出 | Test render output without active_models
@@ -153,6 +209,7 @@ class TestRenderBasic:
         # 验证没有active_models相关内容 | Verify no active_models content
         assert "当前打开的文件内容如下" not in render_output
 
+    @shared_workspace
     def test_render_with_single_active_model(self, project_root_dir, py_workspace):
         """
         测试有单个active_model时的render输出 | Test render output with single active_model
@@ -181,6 +238,7 @@ class TestRenderBasic:
         assert "file_for_test_read.py" in render_output
         assert "当前文件" in render_output or "Current file" in render_output
 
+    @shared_workspace
     def test_render_with_multiple_active_models(self, project_root_dir, py_workspace):
         """
         测试有多个active_models时的render输出 | Test render output with multiple active_models
@@ -195,8 +253,7 @@ class TestRenderBasic:
         file1 = project_root_dir + "/file_for_render_1.py"
         file2 = project_root_dir + "/file_for_test_read.py"
 
-        py_workspace.open_file(uri=f"file://{file1}")
-        py_workspace.open_file(uri=f"file://{file2}")
+        py_workspace.open_files(uris=[f"file://{file1}", f"file://{file2}"])
 
         render_output = py_workspace.render()
 
@@ -212,6 +269,7 @@ class TestRenderBasic:
 class TestRenderDirectoryTree:
     """目录树渲染测试 | Directory tree rendering tests"""
 
+    @shared_workspace
     def test_minimal_expanded_tree_with_active_file(self, temp_workspace_with_makefile):
         """
         测试最小化展开的目录树 | Test minimally expanded directory tree
@@ -234,6 +292,7 @@ class TestRenderDirectoryTree:
         # 验证标记了当前文件 | Verify current file is marked
         assert "当前文件" in render_output or "Current file" in render_output
 
+    @shared_workspace
     def test_directory_tree_without_active_file(self, temp_workspace_with_makefile):
         """
         测试没有活跃文件时的目录树 | Test directory tree without active file
@@ -253,6 +312,7 @@ class TestRenderDirectoryTree:
 class TestRenderShortcutCommands:
     """快捷命令渲染测试 | Shortcut commands rendering tests"""
 
+    @shared_workspace
     def test_render_with_makefile_commands(self, temp_workspace_with_makefile):
         """
         测试检测并渲染Makefile命令 | Test detect and render Makefile commands
@@ -277,6 +337,7 @@ class TestRenderShortcutCommands:
         # 验证不包含.PHONY等内部目标 | Verify doesn't contain .PHONY and other internal targets
         assert ".PHONY" not in render_output
 
+    @shared_workspace
     def test_render_with_mk_files(self, temp_workspace_with_mk_files):
         """
         测试检测并渲染.mk文件中的命令 | Test detect and render commands from .mk files
@@ -332,6 +393,7 @@ class TestRenderShortcutCommands:
         finally:
             workspace.close()
 
+    @shared_workspace
     def test_render_without_makefile(self, project_root_dir, py_workspace):
         """
         测试没有Makefile时的render输出 | Test render output without Makefile
@@ -383,8 +445,7 @@ class TestRenderEdgeCases:
             os.makedirs(deep_path, exist_ok=True)
 
             test_file = os.path.join(deep_path, "deep_file.py")
-            with open(test_file, "w", encoding="utf-8") as f:
-                f.write("# Deep file\nprint('deep')\n")
+            _write(test_file, "# Deep file\nprint('deep')\n")
 
             workspace = PyWorkspace(root_dir=temp_dir, project_name="nested_workspace", diagnostics_timeout=15.0)
             try:
@@ -414,8 +475,7 @@ class TestRenderEdgeCases:
             # 创建包含特殊字符的文件名（但要符合文件系统规范）
             # Create filename with special characters (but comply with filesystem rules)
             test_file = os.path.join(temp_dir, "test-file_123.py")
-            with open(test_file, "w", encoding="utf-8") as f:
-                f.write("# Test file\nprint('test')\n")
+            _write(test_file, "# Test file\nprint('test')\n")
 
             workspace = PyWorkspace(root_dir=temp_dir, project_name="special_chars_workspace", diagnostics_timeout=15.0)
             try:
@@ -428,6 +488,7 @@ class TestRenderEdgeCases:
             finally:
                 workspace.close()
 
+    @shared_workspace
     def test_render_multiple_times(self, project_root_dir, py_workspace):
         """
         测试多次调用render | Test calling render multiple times
@@ -447,6 +508,7 @@ class TestRenderEdgeCases:
         assert render1 == render2
         assert render2 == render3
 
+    @shared_workspace
     def test_render_after_file_operations(self, project_root_dir, py_workspace):
         """
         测试文件操作后的render | Test render after file operations
@@ -493,20 +555,23 @@ class TestRenderIntegration:
 
             # 2. 创建Makefile | Create Makefile
             makefile_path = os.path.join(temp_dir, "Makefile")
-            with open(makefile_path, "w", encoding="utf-8") as f:
-                f.write("""all: build test
+            _write(
+                makefile_path,
+                """all: build test
 
 build:
 \t@echo "Building..."
 
 test:
 \t@echo "Testing..."
-""")
+""",
+            )
 
             # 3. 创建源文件 | Create source files
             main_file = os.path.join(temp_dir, "src", "main.py")
-            with open(main_file, "w", encoding="utf-8") as f:
-                f.write("""# -*- coding: utf-8 -*-
+            _write(
+                main_file,
+                """# -*- coding: utf-8 -*-
 # Main module
 
 def main():
@@ -515,17 +580,20 @@ def main():
 
 if __name__ == "__main__":
     main()
-""")
+""",
+            )
 
             test_file = os.path.join(temp_dir, "tests", "test_main.py")
-            with open(test_file, "w", encoding="utf-8") as f:
-                f.write("""# -*- coding: utf-8 -*-
+            _write(
+                test_file,
+                """# -*- coding: utf-8 -*-
 # Test module
 
 def test_main():
     '''Test main function'''
     assert True
-""")
+""",
+            )
 
             # 4. 初始化workspace | Initialize workspace
             workspace = PyWorkspace(
@@ -534,37 +602,22 @@ def test_main():
 
             try:
                 # 5. 打开文件 | Open files
-                workspace.open_file(uri=f"file://{main_file}")
-                workspace.open_file(uri=f"file://{test_file}")
+                workspace.open_files(uris=[f"file://{main_file}", f"file://{test_file}"])
 
                 # 6. 获取render输出 | Get render output
                 render_output = workspace.render()
 
-                # 7. 验证所有功能都正常工作 | Verify all features work correctly
+                # 7. 单次扫描验证所有功能都正常工作 | Verify all features work correctly in a single scan
+                missing = set(_WORKFLOW_NEEDLES) - set(_WORKFLOW_NEEDLE_RE.findall(render_output))
+                assert not missing, f"render输出缺少 | render output is missing: {missing}"
 
-                # 验证项目信息 | Verify project info
-                assert "当前工作区: integration_test_project" in render_output
-
-                # 验证目录结构 | Verify directory structure
-                assert "项目目录结构" in render_output
-                assert "src/" in render_output
-                assert "tests/" in render_output
-
-                # 验证快捷命令 | Verify shortcut commands
-                assert "项目快捷命令" in render_output
-                assert "make build" in render_output
-                assert "make test" in render_output
-
-                # 验证文件内容 | Verify file content
-                assert "以下是最近使用的文件其结构信息与关键Symbols信息" in render_output
-                assert "当前打开的文件内容如下" in render_output
-                assert "Function: test_main" in render_output or "test_main" in render_output
-
-                print("\n" + "=" * 80)
-                print("完整的Render输出示例 | Complete Render Output Example:")
-                print("=" * 80)
-                print(render_output)
-                print("=" * 80)
+                # 设置 VERBOSE_RENDER 环境变量时输出完整render结果便于调试 | Set VERBOSE_RENDER to print the full output
+                if os.environ.get("VERBOSE_RENDER"):
+                    print("\n" + "=" * 80)
+                    print("完整的Render输出示例 | Complete Render Output Example:")
+                    print("=" * 80)
+                    print(render_output)
+                    print("=" * 80)
 
             finally:
                 workspace.close()
@@ -598,8 +651,9 @@ class TestRenderVerboseMode:
             pkg_dir = os.path.join(temp_dir, "mypackage")
             os.makedirs(pkg_dir)
 
-            with open(os.path.join(pkg_dir, "__init__.py"), "w", encoding="utf-8") as f:
-                f.write('''"""
+            _write(
+                os.path.join(pkg_dir, "__init__.py"),
+                '''"""
 我的包 | My Package
 
 这是一个测试包，用于演示verbose模式
@@ -607,10 +661,12 @@ This is a test package for demonstrating verbose mode
 """
 
 __all__ = ["core", "utils"]
-''')
+''',
+            )
 
-            with open(os.path.join(pkg_dir, "core.py"), "w", encoding="utf-8") as f:
-                f.write('''"""
+            _write(
+                os.path.join(pkg_dir, "core.py"),
+                '''"""
 核心模块 | Core Module
 
 提供核心功能
@@ -626,14 +682,16 @@ def process(data):
 def validate(data):
     """验证数据 | Validate data"""
     return True
-''')
+''',
+            )
 
             # 创建utils子包 | Create utils subpackage
             utils_dir = os.path.join(pkg_dir, "utils")
             os.makedirs(utils_dir)
 
-            with open(os.path.join(utils_dir, "__init__.py"), "w", encoding="utf-8") as f:
-                f.write('''"""
+            _write(
+                os.path.join(utils_dir, "__init__.py"),
+                '''"""
 工具包 | Utils Package
 
 提供辅助工具函数
@@ -641,30 +699,34 @@ Provides utility functions
 """
 
 __all__ = ["helpers"]
-''')
+''',
+            )
 
-            with open(os.path.join(utils_dir, "helpers.py"), "w", encoding="utf-8") as f:
-                f.write('''"""辅助函数模块 | Helper functions module"""
+            _write(
+                os.path.join(utils_dir, "helpers.py"),
+                '''"""辅助函数模块 | Helper functions module"""
 
 def helper_func():
     """辅助函数 | Helper function"""
     pass
-''')
+''',
+            )
 
             # 创建tests目录 | Create tests directory
             tests_dir = os.path.join(temp_dir, "tests")
             os.makedirs(tests_dir)
 
-            with open(os.path.join(tests_dir, "test_core.py"), "w", encoding="utf-8") as f:
-                f.write('''"""测试核心模块 | Test core module"""
+            _write(
+                os.path.join(tests_dir, "test_core.py"),
+                '''"""测试核心模块 | Test core module"""
 
 def test_process():
     assert True
-''')
+''',
+            )
 
             # 创建README | Create README
-            with open(os.path.join(temp_dir, "README.md"), "w", encoding="utf-8") as f:
-                f.write("# Test Project\n\nThis is a test project.\n")
+            _write(os.path.join(temp_dir, "README.md"), "# Test Project\n\nThis is a test project.\n")
 
             workspace = PyWorkspace(root_dir=temp_dir, project_name="verbose_test_project", diagnostics_timeout=15.0)
             yield temp_dir, workspace
@@ -918,12 +980,10 @@ def test_process():
             pkg_dir = os.path.join(temp_dir, "empty_pkg")
             os.makedirs(pkg_dir)
 
-            with open(os.path.join(pkg_dir, "__init__.py"), "w", encoding="utf-8") as f:
-                f.write("")  # 空的__init__.py
+            _write(os.path.join(pkg_dir, "__init__.py"), "")  # 空的__init__.py
 
             test_file = os.path.join(pkg_dir, "module.py")
-            with open(test_file, "w", encoding="utf-8") as f:
-                f.write("# Empty module\npass\n")
+            _write(test_file, "# Empty module\npass\n")
 
             workspace = PyWorkspace(root_dir=temp_dir, project_name="empty_pkg_test", diagnostics_timeout=15.0)
             try:
@@ -3,9 +3,7 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
-import tempfile
-from collections.abc import Generator
-from typing import Any
+from pathlib import Path
 
 import pytest
 from pydantic import AnyUrl
@@ -14,32 +12,38 @@ from ide4ai.environment.workspace.model import TextModel
 from ide4ai.schema import LanguageId
 
 
+@pytest.fixture(scope="session")
+def _reusable_paths(tmp_path_factory) -> Path:
+    """
+    整个会话共享的临时目录，测试文件在其中复用，每个测试只重写内容
+
+    Returns:
+        Path: 临时目录
+    """
+    return tmp_path_factory.mktemp("claude_tool")
+
+
 @pytest.fixture
-def mock_text_model() -> Generator[TextModel, Any, None]:
+def mock_text_model(_reusable_paths) -> TextModel:
     """
     构建一个测试用的代码模型对象。
 
     Returns:
         TextModel: 代码模型对象
     """
-    with tempfile.NamedTemporaryFile() as f:
-        f.write(b"hello world\n")
-        f.flush()
-        model = TextModel(language_id=LanguageId.python, uri=AnyUrl(f"file://{f.name}"))
-        yield model
+    path = _reusable_paths / "single.py"
+    path.write_bytes(b"hello world\n")
+    return TextModel(language_id=LanguageId.python, uri=AnyUrl(f"file://{path}"))
 
 
 @pytest.fixture
-def mock_multiline_text_model() -> Generator[TextModel, Any, None]:
+def mock_multiline_text_model(_reusable_paths) -> TextModel:
     """
     构建一个测试用的多行代码模型对象。
 
     Returns:
         TextModel: 代码模型对象
     """
-    with tempfile.NamedTemporaryFile() as f:
-        f.write(b"hello world\n")
-        f.write(b"hello world\n")
-        f.flush()
-        model = TextModel(language_id=LanguageId.python, uri=AnyUrl(f"file://{f.name}"))
-        yield model
+    path = _reusable_paths / "multiline.py"
+    path.write_bytes(b"hello world\nhello world\n")
+    return TextModel(language_id=LanguageId.python, uri=AnyUrl(f"file://{path}"))
@@ -3,7 +3,7 @@
 # @Author  : JQQ
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
-from ide4ai.utils import is_subdirectory, list_directory_tree
+from ide4ai.utils import detect_makefile_commands, is_subdirectory, list_directory_tree
 
 
 def test_list_directory_tree_all_recursive(fs):
@@ -76,3 +76,16 @@ def test_is_sub_directory(fs):
     # Assert
     assert result is True
     assert not_result is False
+
+
+def test_detect_makefile_commands(fs):
+    fs.create_file(
+        "/proj/Makefile",
+        contents=".PHONY: all\nCC := gcc\nFLAGS = a:b\nall: build\nbuild:\n\techo: build\n",
+    )
+    fs.create_file("/proj/common.mk", contents="# comment\ncompile:\n")
+    fs.create_file("/proj/Makefile.linux", contents="setup:\n")
+    fs.create_dir("/proj/dir.mk")
+
+    assert detect_makefile_commands("/proj") == {"make": ["all", "build", "compile", "setup"]}
+    assert detect_makefile_commands("/missing") is None